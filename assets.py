@@ -0,0 +1,115 @@
+import os
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from font import Font
+
+
+class AssetManager:
+    # Loads each image file from disk once, and keeps each scaled copy of it, so that tiles sharing a letter
+    # (or the tile background, which every tile has) do not load and smoothscale the same image again.
+
+    letter_size = (400, 400)  # The size of the letter images in resources.
+
+    def __init__(self):
+        self.images = {}  # (file name, alpha) : the image as loaded from disk
+        self.scaled_images = {}  # (image, (width, height)) : the image smoothscaled to that size
+        # Images that were preloaded at a size are kept as (file name, (width, height), alpha) instead.
+        self.pending = {}  # file name : future of the image being decoded in the background
+        self.pending_scaled = {}  # (file name, (width, height)) : future of the image being decoded and scaled
+        self.executor = None  # Started by the first preload.
+
+    def preload(self, file_names, size=None):
+        # Starts decoding the images in file_names in background threads, so that load (or scaled) only has to
+        # wait for whatever is not decoded yet. pygame.image.load and smoothscale let other threads run while they
+        # work, and neither needs the display, so this can start before the window is opened.
+        #  - size : if given, the images are also smoothscaled to this size in the background, for scaled.
+        #           Useful for big images that are only ever drawn small.
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                               thread_name_prefix="assets")
+        for file_name in file_names:
+            if size is None:
+                if file_name in self.pending or (file_name, True) in self.images or (file_name, False) in self.images:
+                    continue
+                self.pending[file_name] = self.executor.submit(pygame.image.load, file_name)
+            else:
+                size = (int(size[0]), int(size[1]))
+                key = (file_name, size)
+                if key in self.pending_scaled or (file_name, size, True) in self.scaled_images:
+                    continue
+                self.pending_scaled[key] = self.executor.submit(AssetManager.load_scaled, file_name, size)
+
+    @staticmethod
+    def load_scaled(file_name, size):
+        return pygame.transform.smoothscale(pygame.image.load(file_name), size)
+
+    def load(self, file_name, alpha=True):
+        # Returns the image in file_name, loading it only the first time.
+        #  - alpha : if True, the image keeps its transparency (convert_alpha), otherwise it is made opaque (convert).
+        key = (file_name, alpha)
+        image = self.images.get(key)
+        if image is None:
+            future = self.pending.pop(file_name, None)
+            image = future.result() if future is not None else pygame.image.load(file_name)
+            # Converting needs the display, so it is always done here, on the main thread.
+            image = image.convert_alpha() if alpha else image.convert()
+            self.images[key] = image
+        return image
+
+    def letter(self, letter):
+        # Returns the image of a letter tile's letter, from resources/<letter>.png.
+        # Letters without an image are drawn with a font instead, the same size as the other letter images.
+        file_name = AssetManager.letter_file(letter)
+        if os.path.exists(file_name):
+            return self.load(file_name)
+        key = (file_name, True)
+        image = self.images.get(key)
+        if image is None:
+            image = pygame.Surface(AssetManager.letter_size, pygame.SRCALPHA)
+            font = Font.cache.font("arialblack", AssetManager.letter_size[1] * 4 // 5)
+            text = font.render(letter, True, (0, 0, 0))
+            image.blit(text, text.get_rect(center=image.get_rect().center))
+            self.images[key] = image
+        return image
+
+    @staticmethod
+    def letter_file(letter):
+        return "resources/" + letter + ".png"
+
+    def scale(self, image, size):
+        # Returns image smoothscaled to size, scaling it only the first time.
+        # Only useful for images that are kept, like the ones returned by self.load.
+        #  - size : (width, height). Decimals are dropped, like pygame.transform.smoothscale does.
+        size = (int(size[0]), int(size[1]))
+        key = (image, size)
+        scaled_image = self.scaled_images.get(key)
+        if scaled_image is None:
+            scaled_image = pygame.transform.smoothscale(image, size)
+            self.scaled_images[key] = scaled_image
+        return scaled_image
+
+    def scaled(self, file_name, size, alpha=True):
+        # Returns the image in file_name smoothscaled to size, loading and scaling it only the first time.
+        size = (int(size[0]), int(size[1]))
+        future = self.pending_scaled.pop((file_name, size), None)
+        if future is not None:
+            # Preloaded at this size: only the small scaled copy is converted, the full image is never kept.
+            image = future.result()
+            image = image.convert_alpha() if alpha else image.convert()
+            self.scaled_images[(file_name, size, alpha)] = image
+            return image
+        image = self.scaled_images.get((file_name, size, alpha))
+        if image is not None:
+            return image
+        return self.scale(self.load(file_name, alpha), size)
+
+    def clear(self):
+        # Forgets every image, e.g. if the display mode changes.
+        self.images.clear()
+        self.scaled_images.clear()
+        self.pending.clear()
+        self.pending_scaled.clear()
+
+
+# Shared by everything that draws images.
+assets = AssetManager()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# Runs without a window, so the benchmark works on servers and gives the same numbers on every run.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from process_words import WordProcessor
+from solver import Trie, Solver
+
+# The letters used for the generated dictionary and boards, roughly as often as in English.
+letters = "EEEEEEEEEETTTTTTTAAAAAAAOOOOOOOIIIIIIINNNNNNNSSSSSSRRRRRRHHHHHDDDDLLLLUUUCCCMMMFFYYWWGGPPBBVKXQJZ"
+
+
+def best_time(function, repeat=5, number=1):
+    # Returns the fastest time, in seconds, of calling function number times, out of repeat tries.
+    best = float("inf")
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def write_word_list(file_name, count, seed=0):
+    # Writes count made up words, in the words.txt format (one word per line), to file_name.
+    # The words are the same on every run, so timings can be compared between runs.
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(letters) for i in range(rng.randint(3, 10))))
+    with open(file_name, "w") as file:
+        for word in sorted(words):
+            file.write(word + "\n")
+
+
+def random_boards(count, size=4, seed=0):
+    rng = random.Random(seed)
+    return [[[rng.choice(letters) for col in range(size)] for row in range(size)] for board in range(count)]
+
+
+def bench_startup(repeat):
+    # The time from starting Python to the first frame drawn by main(), in a new process each time,
+    # so that imports, pygame.init(), fonts and images are all included.
+    script = ("import time; start = time.perf_counter()\n"
+              "import main, game\n"
+              "def play(self):\n"
+              "    self.draw()\n"
+              "game.Game.play = play\n"
+              "main.main()\n"
+              "print(time.perf_counter() - start)\n")
+    times = []
+    for i in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), env=os.environ)
+        times.append(float(output.stdout.split()[-1]))
+    return min(times)
+
+
+def drag_events(game, paths):
+    # Returns the events of dragging along each path: press the first tile, move over the rest, release.
+    events = []
+    for path in paths:
+        positions = [game.grid[row][col].rect.center for row, col in path]
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=positions[0], button=1))
+        for pos in positions[1:]:
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(1, 0, 0)))
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=positions[-1], button=1))
+    return events
+
+
+def bench_events(screen, repeat):
+    # The average time per event of Game.play handling scripted drags of every word on the board,
+    # one event per frame, with the frame rate limit turned off.
+    from game import Game
+
+    best = float("inf")
+    for i in range(repeat):
+        game = Game(screen)
+        game.FPS = 0
+        paths = [game.engine.index.path(word) for word in game.engine.index.missed()]
+        events = drag_events(game, paths) + [pygame.event.Event(pygame.QUIT)]
+        queue = iter(events)
+        game.get_events = lambda: [next(queue)]
+        start = time.perf_counter()
+        game.play()
+        best = min(best, (time.perf_counter() - start) / len(events))
+    return best
+
+
+def run(repeat):
+    # Runs every benchmark and returns name : seconds.
+    here = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(here)
+    results = {}
+
+    results["startup_main"] = bench_startup(repeat)
+
+    results["read_words_small"] = best_time(lambda: WordProcessor.readWordsFile("words.txt"), repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        large = os.path.join(directory, "large_words.txt")
+        write_word_list(large, 280000)
+        results["read_words_280k"] = best_time(lambda: WordProcessor.readWordsFile(large), min(repeat, 3))
+        trie = Trie.from_words(WordProcessor.readWordsFile(large))
+
+    boards = random_boards(200)
+    solver = Solver(trie)
+    results["solve_4x4_280k"] = best_time(lambda: [solver.solve(board) for board in boards], repeat) / len(boards)
+
+    pygame.init()
+    screen = pygame.display.set_mode((1150, 627))
+    from game import Game
+
+    results["play_event"] = bench_events(screen, repeat)
+
+    game = Game(screen)
+    results["draw"] = best_time(game.draw, repeat, number=20)
+    guesses = ["P", "PR", "PRO", "PROM (+400)", "PROMS (+800)"]
+    results["draw_text"] = best_time(lambda: [game.draw_text(guess) for guess in guesses], repeat,
+                                     number=20) / len(guesses)
+    pygame.quit()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # Returns the names of the benchmarks that are more than tolerance (e.g. 0.25 for 25%) slower than the baseline.
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:20} {seconds * 1000:10.3f} ms   (no baseline)")
+            continue
+        change = seconds / before - 1
+        flag = "  REGRESSION" if change > tolerance else ""
+        print(f"{name:20} {seconds * 1000:10.3f} ms   baseline {before * 1000:10.3f} ms   {change:+7.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Word Hunt without a display.")
+    parser.add_argument("--output", default="benchmark_results.json", help="where the results are saved")
+    parser.add_argument("--baseline", default="benchmark_baseline.json", help="the results to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="how much slower than the baseline (0.25 = 25%%) counts as a regression")
+    parser.add_argument("--repeat", type=int, default=5, help="each benchmark keeps its best of this many runs")
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    output = os.path.join(here, args.output)
+    baseline_file = os.path.join(here, args.baseline)
+
+    results = run(args.repeat)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+    baseline = {}
+    if os.path.exists(baseline_file):
+        with open(baseline_file) as file:
+            baseline = json.load(file)
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.update_baseline:
+        with open(baseline_file, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print(f"Saved the baseline to {args.baseline}.")
+    elif regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+class Board:
+    # The letters of a square or rectangular board, with a table of which cells are next to each other.
+    # Cells are numbered row * cols + col. A set of cells (like the tiles already in a guess) is an integer
+    # with bit n set for cell n, so "next to this cell and not used yet" is one AND.
+    # The solver and the game engine both use this.
+
+    # (rows, cols) : neighbor bitmask table. Boards of the same size share one table.
+    neighbor_tables = {}
+
+    def __init__(self, letters):
+        #  - letters : a list of rows, where each row is a list of letters (e.g. Game.default_board)
+        self.letters = [[letter.upper() for letter in row] for row in letters]
+        self.rows = len(self.letters)
+        self.cols = len(self.letters[0])
+        assert all(len(row) == self.cols for row in self.letters), "Every row of the board must be the same length."
+        self.size = self.rows * self.cols
+        self.cells = [letter for row in self.letters for letter in row]  # The letters, indexed by cell.
+        self.neighbors = Board.neighbor_masks(self.rows, self.cols)  # Indexed by cell.
+
+    @classmethod
+    def neighbor_masks(cls, rows, cols):
+        # Returns a tuple, indexed by cell, of the bitmask of the cells next to that cell
+        # (horizontally, vertically and diagonally).
+        table = cls.neighbor_tables.get((rows, cols))
+        if table is None:
+            masks = []
+            for row in range(rows):
+                for col in range(cols):
+                    mask = 0
+                    for d_row in (-1, 0, 1):
+                        for d_col in (-1, 0, 1):
+                            r, c = row + d_row, col + d_col
+                            if (d_row or d_col) and 0 <= r < rows and 0 <= c < cols:
+                                mask |= 1 << (r * cols + c)
+                    masks.append(mask)
+            table = tuple(masks)
+            cls.neighbor_tables[(rows, cols)] = table
+        return table
+
+    def cell(self, row, col):
+        # Returns the cell number of (row, col).
+        return row * self.cols + col
+
+    def coords(self, cell):
+        # Returns (row, col) of the cell number.
+        return divmod(cell, self.cols)
+
+    def is_adjacent(self, cell, other_cell):
+        # Checks if two cells are next to each other (horizontally, vertically, diagonally).
+        return bool(self.neighbors[cell] >> other_cell & 1)
+
+    def spell(self, path):
+        # Returns the word spelled by path, a list of (row, col), or None if path is not a valid guess:
+        # empty, off the board, using a tile twice, or with two tiles in a row that are not next to each other.
+        used = 0
+        last = None
+        word = []
+        for row, col in path:
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                return None
+            cell = self.cell(row, col)
+            if used >> cell & 1 or (last is not None and not self.neighbors[last] >> cell & 1):
+                return None
+            used |= 1 << cell
+            last = cell
+            word.append(self.cells[cell])
+        return "".join(word) or None
+
+    def __getitem__(self, row):
+        # board[row][col] is the letter at (row, col), like the list of rows it was made from.
+        return self.letters[row]
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self.letters)
+
+
+def cells_in(mask):
+    # Yields the cell numbers of the bits set in mask, lowest first.
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
@@ -0,0 +1,327 @@
+import argparse
+import json
+import sys
+import time
+from board import Board, cells_in
+from process_words import WordProcessor
+from scoring import ScoringRules
+from generate_boards import english_letter_weights, letter_weights_from_dictionary
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Checked in main, so the rest of the game never needs NumPy.
+
+
+# Statistics of very many random boards, computed with NumPy a whole batch of boards at a time.
+#
+# A batch of boards is an array of shape (boards, cells) of letter numbers (A = 0 ... Z = 25), cells numbered
+# row * cols + col as in Board. Only single letter tiles are supported.
+
+alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class TrieTable:
+    # A dictionary as arrays, so a whole batch of board searches can take one step down the trie at once.
+    #  - child[node, letter] : the node reached by adding letter to node's prefix, or -1. Node 0 is the root.
+    #  -  score[node]        : the score of the word ending at node, or -1 if no word ends there.
+
+    def __init__(self, words):
+        #  - words : (word, score) in alphabetical order, e.g. from Trie.words or CompiledDictionary.words.
+        #            Words with letters outside A-Z are left out.
+        parents = []
+        letters = []
+        scores = {}  # node : score
+        self.words = [""]  # node : the prefix it spells, to name words in reports
+        path = [0]  # The nodes of the previous word's letters, from the root.
+        previous = ""
+        for word, score in words:
+            if not all("A" <= letter <= "Z" for letter in word):
+                continue
+            # Words are sorted, so the new nodes are the ones after the prefix shared with the previous word.
+            shared = 0
+            while shared < min(len(word), len(previous)) and word[shared] == previous[shared]:
+                shared += 1
+            del path[shared + 1:]
+            for letter in word[shared:]:
+                parents.append(path[-1])
+                letters.append(ord(letter) - 65)
+                path.append(len(self.words))
+                self.words.append(self.words[path[-2]] + letter)
+            if score > 0:
+                # Words worth no points can never be found (see Scoreboard), so they are only prefixes here.
+                scores[path[-1]] = score
+            previous = word
+
+        self.size = len(self.words)
+        self.child = np.full((self.size, 26), -1, dtype=np.int32)
+        self.child[np.array(parents, dtype=np.int64), np.array(letters, dtype=np.int64)] = np.arange(1, self.size,
+                                                                                                  dtype=np.int32)
+        self.score = np.full(self.size, -1, dtype=np.int64)
+        self.score[np.fromiter(scores.keys(), dtype=np.int64, count=len(scores))] = np.fromiter(
+            scores.values(), dtype=np.int64, count=len(scores))
+
+    @classmethod
+    def load(cls, file_name, rules=None):
+        # Reads a text word list or compiled dictionary, like WordProcessor.loadDictionary.
+        dictionary = WordProcessor.loadDictionary(file_name, rules)
+        table = cls(dictionary.words())
+        if hasattr(dictionary, "close"):
+            dictionary.close()
+        return table
+
+
+class BoardShape:
+    # The tables for boards of one size: each cell's neighbors, and every path of up to max_gram tiles.
+
+    def __init__(self, rows, cols, max_gram=3):
+        self.rows = rows
+        self.cols = cols
+        self.cells = rows * cols
+        assert self.cells <= 63, "Boards of more than 63 cells do not fit the used tiles bitmask."
+        masks = Board.neighbor_masks(rows, cols)
+        # neighbors[cell] is the cells next to cell, padded with -1 to 8 columns.
+        self.neighbors = np.full((self.cells, 8), -1, dtype=np.int64)
+        for cell, mask in enumerate(masks):
+            around = list(cells_in(mask))
+            self.neighbors[cell, :len(around)] = around
+        # paths[n] is an array of shape (paths, n) of every path of n different tiles, each next to the last.
+        self.paths = {1: np.arange(self.cells, dtype=np.int64)[:, None]}
+        for n in range(2, max_gram + 1):
+            longer = [path + (cell,) for path in map(tuple, self.paths[n - 1])
+                      for cell in cells_in(masks[path[-1]]) if cell not in path]
+            self.paths[n] = np.array(longer, dtype=np.int64).reshape(-1, n)
+
+
+def sample_boards(rng, count, cells, weights):
+    # Returns count random boards, shape (count, cells), with letters drawn with weights (letter : weight).
+    p = np.array([weights.get(letter, 0.0) for letter in alphabet], dtype=np.float64)
+    return rng.choice(26, size=(count, cells), p=p / p.sum()).astype(np.int32)
+
+
+def distinct(values):
+    # Returns the distinct values, sorted. Same as np.unique, which is many times slower on big integer arrays.
+    values = np.sort(values)
+    first = np.empty(len(values), dtype=bool)
+    first[:1] = True
+    np.not_equal(values[1:], values[:-1], out=first[1:])
+    return values[first]
+
+
+def ngram_counts(boards, shape, n):
+    # Returns, for every string of n letters (numbered in base 26, first letter most significant), how many times
+    # it can be dragged on the boards, and on how many boards it can be dragged at least once.
+    # With n = 2 these are how often each ordered pair of letters is next to each other.
+    paths = shape.paths[n]
+    codes = np.zeros((len(boards), len(paths)), dtype=np.int32)
+    for k in range(n):
+        codes *= 26
+        codes += boards[:, paths[:, k]]
+    bins = 26 ** n
+    total = np.bincount(codes.ravel(), minlength=bins)
+    # Each string once per board, for the number of boards that have it: sorting each board's strings
+    # puts repeats next to each other. (Sorting each short row is much faster than one np.unique of the batch.)
+    codes.sort(axis=1)
+    first = np.ones(codes.shape, dtype=bool)
+    first[:, 1:] = codes[:, 1:] != codes[:, :-1]
+    present = np.bincount(codes[first], minlength=bins)
+    return total, present
+
+
+def solve_boards(boards, shape, table, max_paths=1 << 16):
+    # Finds every word on every board, searching all the boards at once: each step extends every partial path
+    # by one tile in all 8 directions, and drops the ones that leave the trie or reuse a tile.
+    # Returns (the number of words on each board, the score of each board, how many boards each trie node's word
+    # is on).
+    #  - max_paths : the most partial paths extended in one step. A bigger frontier is split into slices of this
+    #                size and searched one slice at a time, so memory stays about max_paths * 8 directions * 50 bytes
+    #                (~25 MB) per step, however big the batch or the dictionary.
+    count = len(boards)
+    board = np.repeat(np.arange(count, dtype=np.int64), shape.cells)
+    last = np.tile(np.arange(shape.cells, dtype=np.int64), count)
+    node = table.child[0, boards[board, last]]
+    used = np.left_shift(np.int64(1), last)
+    keep = node >= 0
+    # Frontiers still to extend, as (board, last cell, trie node, used tiles). The deepest is extended first,
+    # so finished slices are freed before the next slice of a shallower frontier is started.
+    frontiers = [(board[keep], last[keep], node[keep], used[keep])]
+
+    found = []  # Arrays of board * table.size + node for every word reached.
+    found_size = 0
+    compact_at = 4 * max_paths
+    while frontiers:
+        board, last, node, used = frontiers.pop()
+        if len(node) > max_paths:
+            for start in reversed(range(0, len(node), max_paths)):
+                stop = start + max_paths
+                frontiers.append((board[start:stop], last[start:stop], node[start:stop], used[start:stop]))
+            continue
+        is_word = table.score[node] >= 0
+        found.append(board[is_word] * table.size + node[is_word])
+        found_size += len(found[-1])
+        if found_size > compact_at:
+            # The same word is often reached along many paths: keep each (board, word) once. Next time, only
+            # once the list has doubled again, so compacting costs no more than the search itself.
+            found = [distinct(np.concatenate(found))]
+            found_size = len(found[0])
+            compact_at = max(compact_at, 2 * found_size)
+        # Every (path, direction) at once, shape (paths, 8). Missing neighbors point at cell 0 and are masked out.
+        next_cell = shape.neighbors[last]
+        ok = next_cell >= 0
+        next_cell[~ok] = 0
+        ok &= (np.right_shift(used[:, None], next_cell) & 1) == 0
+        child = table.child[node[:, None], boards[board[:, None], next_cell]]
+        ok &= child >= 0
+        rows, directions = np.nonzero(ok)
+        if len(rows):
+            last = next_cell[rows, directions]
+            frontiers.append((board[rows], last, child[rows, directions],
+                              used[rows] | np.left_shift(np.int64(1), last)))
+
+    # A word found along several paths counts once per board.
+    found = distinct(np.concatenate(found)) if found else np.zeros(0, dtype=np.int64)
+    found_board, found_node = np.divmod(found, table.size)
+    words = np.bincount(found_board, minlength=count)
+    scores = np.bincount(found_board, weights=table.score[found_node], minlength=count)
+    return words, scores.astype(np.int64), np.bincount(found_node, minlength=table.size)
+
+
+def summarize(values):
+    # Returns the mean, standard deviation and percentiles of an array.
+    values = np.asarray(values)
+    percentiles = np.percentile(values, [0, 1, 10, 25, 50, 75, 90, 99, 100])
+    return {
+        "mean": round(float(values.mean()), 3),
+        "std": round(float(values.std()), 3),
+        "percentiles": {str(p): float(v) for p, v in zip([0, 1, 10, 25, 50, 75, 90, 99, 100], percentiles)},
+    }
+
+
+def gram_name(code, n):
+    letters = []
+    for i in range(n):
+        code, letter = divmod(code, 26)
+        letters.append(alphabet[letter])
+    return "".join(reversed(letters))
+
+
+def top_grams(counts, n, top):
+    order = np.argsort(-counts, kind="stable")[:top]
+    return [[gram_name(int(code), n), int(counts[code])] for code in order if counts[code] > 0]
+
+
+def analyze(table, weights, boards_count, size, batch, seed, max_gram, solve=True):
+    # Samples boards_count boards in batches and returns the report (a dictionary ready for JSON).
+    shape = BoardShape(size, size, max_gram)
+    rng = np.random.default_rng(seed)
+    words = []
+    scores = []
+    on_boards = np.zeros(table.size, dtype=np.int64)
+    grams = {n: [np.zeros(26 ** n, dtype=np.int64), np.zeros(26 ** n, dtype=np.int64)]
+             for n in range(2, max_gram + 1)}
+
+    start = time.perf_counter()
+    done = 0
+    while done < boards_count:
+        boards = sample_boards(rng, min(batch, boards_count - done), shape.cells, weights)
+        for n, (total, present) in grams.items():
+            batch_total, batch_present = ngram_counts(boards, shape, n)
+            total += batch_total
+            present += batch_present
+        if solve:
+            batch_words, batch_scores, batch_on_boards = solve_boards(boards, shape, table)
+            words.append(batch_words)
+            scores.append(batch_scores)
+            on_boards += batch_on_boards
+        done += len(boards)
+        elapsed = time.perf_counter() - start
+        print(f"\r{done}/{boards_count} boards, {done / elapsed:.0f} boards/s", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    report = {"boards": boards_count, "size": size, "seconds": round(elapsed, 3)}
+    if solve:
+        words = np.concatenate(words)
+        scores = np.concatenate(scores)
+        report["words"] = summarize(words)
+        report["score"] = summarize(scores)
+        report["words_histogram"] = {str(i): int(c) for i, c in enumerate(np.bincount(words)) if c}
+        report["no_words"] = int((words == 0).sum())
+        order = np.argsort(-on_boards, kind="stable")[:25]
+        report["most_common_words"] = [[table.words[node], round(int(on_boards[node]) / boards_count, 5)]
+                                       for node in order if on_boards[node] > 0]
+    for n, (total, present) in grams.items():
+        report[f"{n}-grams"] = {
+            "most_adjacent" if n == 2 else "most_common": top_grams(total, n, 25),
+            "on_most_boards": [[gram, round(count / boards_count, 5)] for gram, count in top_grams(present, n, 25)],
+        }
+    return report
+
+
+def check(table, file_name, size, count, seed, weights, rules=None):
+    # Compares solve_boards with the Solver on count boards. Returns the number of boards that differ.
+    from solver import Solver
+
+    shape = BoardShape(size, size, 1)
+    boards = sample_boards(np.random.default_rng(seed), count, shape.cells, weights)
+    words, scores, on_boards = solve_boards(boards, shape, table)
+    solver = Solver(WordProcessor.loadDictionary(file_name, rules))
+    differ = 0
+    for i, cells in enumerate(boards):
+        letters = [[alphabet[cells[row * size + col]] for col in range(size)] for row in range(size)]
+        solutions = solver.solve(letters)
+        scored = [solution.score for solution in solutions.values() if solution.score > 0]
+        if len(scored) != words[i] or sum(scored) != scores[i]:
+            differ += 1
+    return differ
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics of many random boards: word counts, scores, "
+                                                 "and how often letters are next to each other.")
+    parser.add_argument("dictionary", help="a text word list or compiled dictionary (see compiled_words.py)")
+    parser.add_argument("--boards", type=int, default=1000000, help="the number of boards to sample")
+    parser.add_argument("--size", type=int, default=4, help="the number of rows and columns on each board")
+    parser.add_argument("--batch", type=int, default=2000,
+                        help="the number of boards sampled at once. Besides the dictionary's tables and the search "
+                             "(about 25 MB whatever the batch), each board in a batch costs about 1 KB, plus up to "
+                             "16 bytes per word on it: about 12 KB a board with a 280,000 word dictionary")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ngram", type=int, default=3, help="count letter strings of up to this many tiles")
+    parser.add_argument("--no-solve", action="store_true", help="only count letter pairs and n-grams")
+    parser.add_argument("--letters-from-dictionary", action="store_true",
+                        help="sample letters as often as they appear in the dictionary, instead of in English")
+    parser.add_argument("--scoring", help="a JSON file of scoring rules (see scoring.ScoringRules)")
+    parser.add_argument("--check", type=int, default=0,
+                        help="first compare the vectorized search with the Solver on this many boards")
+    parser.add_argument("--output", help="where the report is written as JSON (default: printed)")
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit("board_stats.py needs NumPy: pip install numpy")
+
+    weights = letter_weights_from_dictionary(args.dictionary) if args.letters_from_dictionary \
+        else english_letter_weights
+    rules = ScoringRules.from_file(args.scoring) if args.scoring else None
+    table = TrieTable.load(args.dictionary, rules)
+
+    if args.check:
+        differ = check(table, args.dictionary, args.size, args.check, args.seed, weights, rules)
+        print(f"{args.check - differ} of {args.check} boards match the Solver.", file=sys.stderr)
+        if differ:
+            sys.exit(1)
+
+    report = analyze(table, weights, args.boards, args.size, args.batch, args.seed, args.ngram,
+                     solve=not args.no_solve)
+    text = json.dumps(report, indent=1)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+    print(f"{args.boards} boards in {report['seconds']:.2f}s: {args.boards / report['seconds']:.0f} boards/s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from solver import Solver
+from process_words import WordProcessor
+
+
+class Bot:
+    # A player for load testing a MatchServer: joins a match, solves the board with its own copy of the dictionary,
+    # and sends the paths of the words it finds (and some bad guesses) at a steady rate until the match ends.
+
+    # board (a tuple of rows) : list of paths of the words on it, shared by every bot, so each board is solved once.
+    solutions = {}
+
+    def __init__(self, solver, match, name, rate=2.0, mistakes=0.1, seed=None):
+        #  -  solver  : a Solver with the same dictionary as the server
+        #  -   rate   : guesses sent per second
+        #  - mistakes : the fraction of guesses that are random paths, which the server should reject
+        self.solver = solver
+        self.match = match
+        self.name = name
+        self.rate = rate
+        self.mistakes = mistakes
+        self.rng = random.Random(seed)
+        self.player = None
+        self.sent = 0  # Guesses sent.
+        self.accepted = 0  # Guesses of this bot that the server scored.
+        self.rejected = 0
+        self.received = 0  # Messages received, including other players' words.
+        self.score = 0
+        self.latencies = []  # Seconds from sending a word to the server announcing it.
+        self.sent_at = {}  # word : when it was sent
+
+    def paths(self, board):
+        key = tuple(board)
+        paths = Bot.solutions.get(key)
+        if paths is None:
+            solutions = self.solver.solve([list(row) for row in board])
+            paths = [solution.path for solution in solutions.values() if solution.score > 0]
+            Bot.solutions[key] = paths
+        return paths
+
+    async def run(self, host, port):
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+        writer.write(Bot.encode({"type": "join", "match": self.match, "name": self.name}))
+        guesses = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                self.received += 1
+                kind = message["type"]
+                if kind == "welcome":
+                    self.player = message["player"]
+                    board = message["board"]
+                    paths = list(self.paths(board))
+                    self.rng.shuffle(paths)
+                    guesses = asyncio.ensure_future(self.guess(writer, board, paths))
+                elif kind == "word" and message["player"] == self.player:
+                    self.accepted += 1
+                    self.score = message["total"]
+                    sent_at = self.sent_at.pop(message["word"], None)
+                    if sent_at is not None:
+                        self.latencies.append(time.perf_counter() - sent_at)
+                elif kind == "rejected":
+                    self.rejected += 1
+                elif kind == "end":
+                    break
+        finally:
+            if guesses is not None:
+                guesses.cancel()
+            writer.close()
+
+    async def guess(self, writer, board, paths):
+        # Sends one guess every 1 / rate seconds: usually the next word's path, sometimes a random path.
+        rows, cols = len(board), len(board[0])
+        for path in paths:
+            await asyncio.sleep(self.rng.expovariate(self.rate))
+            if self.rng.random() < self.mistakes:
+                path = [(self.rng.randrange(rows), self.rng.randrange(cols)) for i in range(3)]
+            else:
+                self.sent_at["".join(board[row][col] for row, col in path)] = time.perf_counter()
+            writer.write(Bot.encode({"type": "path", "path": path}))
+            self.sent += 1
+
+    @staticmethod
+    def encode(message):
+        return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+async def load_test(args):
+    solver = Solver(WordProcessor.loadDictionary(args.dictionary))
+    bots = [Bot(solver, f"match{i % args.matches}", f"bot{i}", args.rate, args.mistakes, seed=i)
+            for i in range(args.bots)]
+    start = time.perf_counter()
+    # Connecting is spread out a little, so the server's listen backlog is not overrun.
+    tasks = []
+    for bot in bots:
+        tasks.append(asyncio.ensure_future(bot.run(args.host, args.port)))
+        await asyncio.sleep(args.connect_delay)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if isinstance(result, Exception)]
+    latencies = [latency for bot in bots for latency in bot.latencies]
+    sent = sum(bot.sent for bot in bots)
+    received = sum(bot.received for bot in bots)
+    print(f"{len(bots) - len(failed)} of {len(bots)} bots finished in {elapsed:.1f}s"
+          + (f" ({len(failed)} failed, e.g. {failed[0]!r})" if failed else ""))
+    print(f"sent {sent} guesses ({sent / elapsed:.0f}/s), {sum(bot.accepted for bot in bots)} accepted, "
+          f"{sum(bot.rejected for bot in bots)} rejected")
+    print(f"received {received} messages ({received / elapsed:.0f}/s)")
+    print(f"word latency: median {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a Word Hunt match server (server.py) with bots.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dictionary", default="words.txt", help="the same dictionary the server uses")
+    parser.add_argument("--bots", type=int, default=100, help="the number of bots to connect")
+    parser.add_argument("--matches", type=int, default=10, help="the bots are spread evenly over this many matches")
+    parser.add_argument("--rate", type=float, default=2.0, help="guesses per second per bot")
+    parser.add_argument("--mistakes", type=float, default=0.1, help="the fraction of guesses that are random paths")
+    parser.add_argument("--connect-delay", type=float, default=0.001, help="seconds between connecting bots")
+    args = parser.parse_args()
+    asyncio.run(load_test(args))
+
+
+if __name__ == "__main__":
+    main()
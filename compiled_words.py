@@ -0,0 +1,186 @@
+import argparse
+import mmap
+import os
+import struct
+from solver import Trie
+
+
+class CompiledNode:
+    # A view of one node in a CompiledDictionary. It has the same attributes as solver.TrieNode
+    # (children, word, score), so the Solver and GuessCursor work on a compiled dictionary unchanged.
+    # The node is its own self.children: it has get(letter) and len() like the TrieNode.children dictionary.
+    __slots__ = ("data", "offset", "prefix", "count", "word", "score", "children")
+
+    def __init__(self, data, offset, prefix):
+        self.data = data
+        self.offset = offset
+        self.prefix = prefix  # The letters from the root to this node.
+        self.count, flags, self.score = CompiledDictionary.node_header.unpack_from(data, offset)
+        self.word = prefix if flags & CompiledDictionary.is_word else None
+        self.children = self
+
+    def get(self, letter):
+        # Returns the child node for letter, or None if no word continues with letter.
+        if not letter.isascii():
+            return None  # Only ASCII letters are compiled.
+        start = self.offset + CompiledDictionary.node_header.size
+        index = self.data.find(letter.encode("ascii"), start, start + self.count)
+        if index < 0:
+            return None
+        edge = start + self.count + 4 * (index - start)
+        child_offset = CompiledDictionary.edge.unpack_from(self.data, edge)[0]
+        return CompiledNode(self.data, child_offset, self.prefix + letter)
+
+    def __len__(self):
+        return self.count
+
+
+class CompiledDictionary:
+    # A word list compiled into a compact binary trie, with identical branches stored once (a DAWG),
+    # and loaded with mmap. Loading does not read the file; pages are read as the trie is walked, and
+    # processes on the same machine that load the same file share one copy of it in memory.
+    #
+    # File layout (little endian):
+    #   header: magic (8 bytes), version (u32), node count (u32), word count (u32), root offset (u32),
+    #           the version of the ScoringRules the scores were worked out with (16 bytes, ASCII, 0 padded)
+    #   nodes:  edge count (u8), flags (u8), score (i32), the edges' letters (1 byte each, ASCII),
+    #           then the edges' child node offsets (u32 each). Letters are sorted.
+
+    magic = b"WORDHUNT"
+    version = 3  # 2: scores are signed, since scoring rules can make a word worth less than nothing. 3: rules version.
+    header = struct.Struct("<8sIIII16s")
+    node_header = struct.Struct("<BBi")
+    edge = struct.Struct("<I")
+    is_word = 1  # Flag for a node that ends a word.
+
+    def __init__(self, file_name):
+        assert os.path.exists(file_name), "Cannot find the compiled dictionary: %s" % (file_name)
+        with open(file_name, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        # The magic and version come first in every version, so they are checked before the rest is read.
+        magic, version = struct.unpack_from("<8sI", self.data)
+        assert magic == CompiledDictionary.magic, "Not a compiled dictionary: %s" % (file_name)
+        assert version == CompiledDictionary.version, "Unsupported compiled dictionary version: %d" % (version)
+        _, _, self.node_count, self.size, self.root_offset, rules_version = \
+            CompiledDictionary.header.unpack_from(self.data)
+        self.rules_version = rules_version.rstrip(b"\0").decode("ascii")  # See ScoringRules.version.
+
+    @property
+    def root(self):
+        return CompiledNode(self.data, self.root_offset, "")
+
+    def find(self, prefix):
+        # Returns the node reached by following prefix from the root, or None if no word starts with prefix.
+        node = self.root
+        for letter in prefix:
+            node = node.get(letter)
+            if node is None:
+                return None
+        return node
+
+    def score(self, word):
+        # Returns the score of word, or None if it is not in the dictionary.
+        node = self.find(word)
+        if node is None or node.word is None:
+            return None
+        return node.score
+
+    def score_of(self, node):
+        # Returns the score of the word ending at node, like Trie.score_of.
+        return node.score
+
+    def __contains__(self, word):
+        node = self.find(word)
+        return node is not None and node.word is not None
+
+    def __len__(self):
+        return self.size
+
+    def words(self):
+        # Yields (word, score) for every word, in alphabetical order.
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.word is not None:
+                yield node.word, node.score
+            start = node.offset + CompiledDictionary.node_header.size
+            letters = self.data[start:start + node.count].decode("ascii")
+            stack.extend(node.get(letter) for letter in reversed(letters))
+
+    def close(self):
+        self.data.close()
+
+    @staticmethod
+    def compile(words, file_name, rules=None):
+        # Writes words to file_name as a compiled dictionary.
+        #  - words : a Trie (which has its own rules), a dictionary of word : score, or an iterable of words
+        #            Words with letters outside ASCII (e.g. CAFÉ) are left out: each letter is stored in one byte.
+        #  - rules : the ScoringRules that score words given without a score. Defaults to scoring.default_rules.
+        #            Their version is stored in the file, so the dictionary is only loaded with the same rules.
+        # Returns the number of nodes written.
+        trie = words if isinstance(words, Trie) else Trie.from_words(words, rules)
+        data = bytearray(CompiledDictionary.header.size)
+        offsets = {}  # The signature of each node written : its offset. Identical branches are written once.
+        word_count = 0
+
+        def write(node):
+            # Writes the node's children, then the node itself. Returns the node's offset.
+            nonlocal word_count
+            letters = sorted(letter for letter in node.children if letter.isascii())
+            children = [write(node.children[letter]) for letter in letters]
+            flags = CompiledDictionary.is_word if node.word is not None else 0
+            if node.word is not None:
+                word_count += 1
+            score = trie.score_of(node) if node.word is not None else 0
+            signature = (flags, score, "".join(letters), tuple(children))
+            offset = offsets.get(signature)
+            if offset is None:
+                offset = len(data)
+                data.extend(CompiledDictionary.node_header.pack(len(letters), flags, score))
+                data.extend("".join(letters).encode("ascii"))
+                for child in children:
+                    data.extend(CompiledDictionary.edge.pack(child))
+                offsets[signature] = offset
+            return offset
+
+        root_offset = write(trie.root)
+        CompiledDictionary.header.pack_into(data, 0, CompiledDictionary.magic, CompiledDictionary.version,
+                                            len(offsets), word_count, root_offset,
+                                            trie.scores.rules.version.encode("ascii"))
+        with open(file_name, "wb") as file:
+            file.write(data)
+        return len(offsets)
+
+    @staticmethod
+    def is_compiled(file_name):
+        # Checks if file_name is a compiled dictionary, rather than a text word list.
+        with open(file_name, "rb") as file:
+            return file.read(len(CompiledDictionary.magic)) == CompiledDictionary.magic
+
+
+def main():
+    # Compiles a text word list, scored by the default rules or the rules in --scoring.
+    # Score lines after the words, in old word lists, are ignored (see WordProcessor.readWordsFile).
+    from process_words import WordProcessor
+    from scoring import ScoringRules
+
+    parser = argparse.ArgumentParser(description="Compile a word list into a memory-mapped dictionary.")
+    parser.add_argument("source", help="the text word list")
+    parser.add_argument("target", help="the compiled dictionary file to write")
+    parser.add_argument("--scoring", help="a JSON file of scoring rules (see scoring.ScoringRules). The dictionary "
+                                          "must then be loaded with the same rules")
+    args = parser.parse_args()
+
+    rules = ScoringRules.from_file(args.scoring) if args.scoring else None
+    words = WordProcessor.loadDictionary(args.source, rules)
+    assert isinstance(words, Trie), "Already compiled: %s" % (args.source)
+    nodes = CompiledDictionary.compile(words, args.target)
+    compiled = CompiledDictionary(args.target)
+    if len(compiled) < len(words):
+        print(f"{len(words) - len(compiled)} words with letters outside ASCII were left out.")
+    print(f"{len(compiled)} words, {nodes} nodes, {os.path.getsize(args.target)} bytes -> {args.target}")
+    compiled.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from solver import Trie, GuessCursor
+from board import Board
+from word_index import WordIndex
+from scoreboard import Scoreboard
+
+
+class GameEngine:
+    # The rules of one game, with no display: the board, the guess being dragged, scoring, the words found
+    # and the timer. Game draws it and feeds it mouse events; bots and load tests can drive it directly.
+
+    def __init__(self, board, words, timer=80, trie=None, solutions=None):
+        #  - board : a Board, or a list of rows of letters. Any number of rows and columns.
+        #  - words : dictionary of accepted words (in all caps) : score, e.g. from WordProcessor.solveBoard
+        #  - timer : the length of the game in seconds
+        #  - trie  : a Trie of words. Pass one in to share it between many games on the same board.
+        #  - solutions : dictionary of word : Solution with every path, e.g. from SolveCache.solve,
+        #                so the board does not have to be solved again to find where the words are.
+        self.board = board if isinstance(board, Board) else Board(board)
+        self.rows = self.board.rows
+        self.cols = self.board.cols
+        self.words = words
+        self.trie = trie or Trie.from_words(words)  # Used to follow the guess one tile at a time.
+        self.timer = timer
+        # The words found, the score, and the triggers to run when particular words are found.
+        self.scoreboard = Scoreboard(words)
+        self.path = []  # (row, col) of each tile in the guess being dragged, in order.
+        self.used = 0  # Bitmask of the cells in self.path.
+        self.last = None  # The cell number of the last tile in self.path.
+        # Follows the guess through self.trie, so each tile added to the guess is one step rather than a new lookup.
+        self.cursor = GuessCursor(self.trie, self.scoreboard.found)
+        # Where every word is on the board, and how many are left by starting tile and by length.
+        self.index = WordIndex(solutions) if solutions is not None else WordIndex.build(self.board, self.trie)
+        self.scoreboard.on_any_word(lambda word, score: self.index.mark_found(word))
+
+    @property
+    def guessed_words(self):
+        # The set of self.words that have been guessed.
+        return self.scoreboard.found
+
+    @property
+    def word_num(self):
+        # The number of words guessed correctly.
+        return self.scoreboard.word_num
+
+    @property
+    def score_num(self):
+        # The player's score.
+        return self.scoreboard.score_num
+
+    @property
+    def is_over(self):
+        # True once the timer has run out.
+        return self.timer <= 0
+
+    @property
+    def guess(self):
+        # The letters being dragged.
+        return self.cursor.text
+
+    def tick(self, seconds=1):
+        # Counts the timer down. The timer never goes below 0.
+        self.timer = max(self.timer - seconds, 0)
+
+    def press(self, row, col):
+        # Starts a new guess on the tile at (row, col). Returns False if the game is over.
+        if self.is_over:
+            return False
+        self.last = self.board.cell(row, col)
+        self.used = 1 << self.last
+        self.path = [(row, col)]
+        self.cursor.reset()
+        self.cursor.push(self.board.cells[self.last])
+        return True
+
+    def drag(self, row, col):
+        # Adds the tile at (row, col) to the guess, if a guess has been started, the tile is next to the
+        # last tile in the guess, and the tile is not already in the guess. Returns True if the tile was added.
+        if self.is_over or not self.path:
+            return False
+        cell = self.board.cell(row, col)
+        # The tile must be next to the last tile and not used yet.
+        if not (self.board.neighbors[self.last] & ~self.used) >> cell & 1:
+            return False
+        self.used |= 1 << cell
+        self.last = cell
+        self.path.append((row, col))
+        self.cursor.push(self.board.cells[cell])
+        return True
+
+    def release(self):
+        # Ends the guess and scores it. Returns the points the guess was worth (0 if it was not a new word).
+        score = self.update_score(self.cursor.text)
+        self.path = []
+        self.used = 0
+        self.last = None
+        self.cursor.reset()
+        return score
+
+    def play_path(self, path):
+        # Presses, drags along and releases the tiles in path, a list of (row, col). Returns the points gained.
+        if not path or not self.press(*path[0]):
+            return 0
+        for row, col in path[1:]:
+            self.drag(row, col)
+        return self.release()
+
+    def is_adjacent(self, coords, other_coords):
+        # Checks if two tiles, given as (row, col), are next to each other (horizontally, vertically, diagonally).
+        return self.board.is_adjacent(self.board.cell(*coords), self.board.cell(*other_coords))
+
+    def score(self, guess):
+        # Returns an integer, score, for that particular word, from the trie's score table.
+        # Returns 0 if the guess is not a proper guess.
+        return self.trie.score(guess) or 0
+
+    def update_score(self, guess):
+        # Adds guess to the words found and its score to the player's score, if it is a new word.
+        # Returns the points gained.
+        score = self.score(guess)
+        return score if self.scoreboard.add(guess, score) else 0
+
+    def is_word(self, guess):
+        return guess in self.words
+
+    def is_guessed_word(self, guess):
+        return guess in self.scoreboard.found
@@ -1,23 +1,114 @@
+import json
+import os
 import pygame
+from collections import OrderedDict
+from user_dirs import cache_file
+
+class FontCache:
+    """Remembers which font file each system font name resolves to, in a file, so that only the first start
+    has to search the system font directories (pygame.font.SysFont runs fc-list on Linux to do it)."""
+    def __init__(self, file_name=None):
+        if file_name is None:
+            file_name = cache_file("fonts.json")
+        self.file_name = file_name
+        self.paths = None  # "name|bold" : [font file or None for pygame's default font, whether to set_bold]
+
+    def read(self):
+        self.paths = {}
+        try:
+            with open(self.file_name) as file:
+                self.paths = json.load(file)
+        except (OSError, ValueError):
+            pass
+
+    def write(self):
+        # The cache only saves time, so failing to write it is not an error.
+        try:
+            os.makedirs(os.path.dirname(self.file_name), exist_ok=True)
+            with open(self.file_name, "w") as file:
+                json.dump(self.paths, file, indent=1, sort_keys=True)
+        except OSError:
+            pass
+
+    def font(self, name, size, bold=False):
+        # Returns the same font as pygame.font.SysFont(name, size, bold), searching for the file only
+        # if it is not cached, the cached file no longer exists, or the font was not found last time
+        # (it may have been installed since).
+        if self.paths is None:
+            self.read()
+        key = f"{name}|{int(bold)}"
+        cached = self.paths.get(key)
+        if cached is None or cached[0] is None or not os.path.exists(cached[0]):
+            # SysFont does the search, and hands the file it picked to the constructor.
+            found = pygame.font.SysFont(name, size, bold, constructor=lambda path, size, bold, italic: [path, bold])
+            if found != cached:
+                self.paths[key] = found
+                self.write()
+            cached = found
+        path, set_bold = cached
+        font = pygame.font.Font(path, size)
+        if set_bold:
+            font.set_bold(True)
+        return font
+
 
 class Font:
     """Contains fonts for use in the game."""
+    # Shared by every Font, so the cache file is read once.
+    cache = FontCache()
+
     def __init__(self):
         pygame.font.init()
-        self.title_font = pygame.font.SysFont("arialblack", 60)
-        self.score_font = pygame.font.SysFont("arialblack", 30)
-        # self.words_font = pygame.font.SysFont("arialblack", 25)
-        self.guess_font = pygame.font.SysFont("verdana", 50, bold=True)
+        self.title_font = Font.cache.font("arialblack", 60)
+        self.score_font = Font.cache.font("arialblack", 30)
+        # self.words_font = Font.cache.font("arialblack", 25)
+        self.guess_font = Font.cache.font("verdana", 50, bold=True)
+        self.hud_font = Font.cache.font("verdana", 14)
+
+class TextCache:
+    """Keeps rendered text surfaces, so that a label that has not changed is never rendered again."""
+    def __init__(self, max_size=256):
+        self.max_size = max_size  # The most surfaces kept. The least recently used one is dropped first.
+        self.surfaces = OrderedDict()  # (font, text, color, background) : (surface, size)
+        self.hits = 0  # The number of renders that were found in the cache.
+        self.misses = 0  # The number of renders that had to be done by the font.
+
+    def render(self, font, text, color=(0, 0, 0), background=None):
+        # Returns (surface, size) for the text, rendering it only if it is not already cached.
+        # Colors are turned into tuples, because pygame.Color cannot be used as a dictionary key.
+        key = (font, text, tuple(color), None if background is None else tuple(background))
+        cached = self.surfaces.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        cached = (font.render(text, True, color, background), font.size(text))
+        self.surfaces[key] = cached
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return cached
+
+    def clear(self):
+        # Empties the cache and resets the counters.
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
 
 class Text:
+    # Shared by every Text, so that the same label is only rendered once.
+    cache = TextCache()
+
     def __init__(self, text, x, y, font, color=(0, 0, 0), background=None):
         self.x = x  # Horizontal center or top left of box, depends on which draw method you use.
         self.y = y  # Vertical center or top left of box
         # Start PyGame Font
         pygame.font.init()
 
-        self.txt = font.render(text, True, color, background)
-        self.size = font.size(text)  # (width, height)
+        # self.size is (width, height)
+        self.txt, self.size = Text.cache.render(font, text, color, background)
 
     def draw_centered(self, screen):
         drawX = self.x - (self.size[0] // 2)
@@ -1,46 +1,104 @@
+import os
+import time
 import pygame
 from tile import Tile
-from font import Font, Text
-from process_words import WordProcessor
+from font import Font
+from solve_cache import shared_cache
 from star import Star
+from engine import GameEngine
+from grid_index import GridIndex
+from renderer import Renderer
+from assets import AssetManager, assets
+from profiler import Profiler
 
 
 class Game:
     # An object in this class represents a complete game.
-    def __init__(self, screen):
+
+    # The guess label's background when no word on the board starts with the guess.
+    dead_color = pygame.Color(230, 160, 160)
+
+    # The number of frames each missed word is shown for at the end of the game.
+    reveal_frames = 45
+
+    # The (x, y) screen position of the top left tile.
+    grid_origin = (30, 30)
+
+    # The board that is played when no other board is given.
+    default_board = [
+        ["P", "R", "S", "U"],
+        ["E", "S", "O", "I"],
+        ["R", "M", "T", "R"],
+        ["D", "A", "P", "A"]
+    ]
+
+    # The image behind everything. Its size is the size of the window.
+    background_file = "resources/background.png"
+
+    @staticmethod
+    def preload(board=None):
+        # Starts decoding the images a game of board needs in the background (see AssetManager.preload).
+        # main calls it before opening the window, so the images are ready by the time Game needs them.
+        board = board or Game.default_board
+        letters = sorted({letter for row in board for letter in row})
+        assets.preload([Game.background_file, Tile.image_file, Star.files[1]]
+                       + [AssetManager.letter_file(letter) for letter in letters
+                          if os.path.exists(AssetManager.letter_file(letter))])
+        assets.preload(Star.files[:1], Star.size)
+
+    def __init__(self, screen, board=None, words=None):
         # - screen is the display window surface object
+        # -  board is a list of rows of letters. Defaults to Game.default_board.
+        # -  words is the dictionary of accepted words : score for this board, e.g. from WordProcessor.solveBoard.
+        #    If it is not given, the board is solved against words.txt.
 
         self.screen = screen
-        self.bg = pygame.image.load("resources/background.png").convert()
+        board = board or Game.default_board
+        Game.preload(board)
+        self.bg = assets.load(Game.background_file, alpha=False)
         self.bg_color = (75, 94, 72)  # (75, 94, 72) is darkGreen
         self.white = (255, 255, 255)
         self.FPS = 60
+        self.get_events = pygame.event.get  # Returns the events for the next frame. Scripts can replace it.
         self.game_Clock = pygame.time.Clock()
-        self.timer = 80  # The timer is 80 seconds.
         self.font = Font()
         self.close_clicked = False  # When this is true, the game closes.
         self.continue_game = True  # When this is false, the gameplay has ended but the screen remains present.
-        self.words = WordProcessor.readWordsFile("words.txt")  # dictionary of accepted words (in all caps) : score
-        self.guessed_words = []  # The self.words that have been guessed.
-        self.word_num = 0  # The number of words guessed correctly. Used in the label on screen.
-        self.score_num = 0  # The player's score. Used in the label on screen.
+        solutions = None
+        if words is None:
+            # Solved boards are cached on disk, so a board that was played before is not solved again.
+            solutions = shared_cache().solve_file(board, "words.txt")
+            words = {word: solution.score for word, solution in solutions.items()}
+        # The rules of the game: the board, the guess, the score and the timer (80 seconds).
+        # Game only draws the engine and passes mouse and timer events to it.
+        self.engine = GameEngine(board, words, timer=80, solutions=solutions)
+        self.board = self.engine.board
+        self.words = self.engine.words  # dictionary of accepted words (in all caps) : score
         self.grid = []
         self.star = Star(self.screen)  # Initializes the star.
-        self.prom_guessed = False
-
-
-
-        self.board = [
-            ["P", "R", "S", "U"],
-            ["E", "S", "O", "I"],
-            ["R", "M", "T", "R"],
-            ["D", "A", "P", "A"]
-        ]
+        self.prom_guessed = False  # PROM earns the star.
+        self.pointer = None  # The last (x, y) mouse position handled.
+        self.hint_path = []  # The tiles lit up by the last hint, until the player presses a tile.
+        self.reveal_words = None  # The missed words left to show at the end of the game.
+        self.reveal_path = []  # The tiles of the missed word being shown.
+        self.reveal_frame = 0  # The number of frames since the end of the game.
+        # Redraws and shows only the parts of the screen that changed.
+        self.renderer = Renderer(self.screen, self.bg, self.bg_color)
+        # Times each stage of a frame while it is enabled (press F3). Costs almost nothing while disabled.
+        self.profiler = Profiler()
+        # Set to a ResultLog to save the game's result there when it ends (main does).
+        self.result_log = None
+        self.started = None  # time.perf_counter() when play started.
+        self.timer_length = None  # The length of the game in seconds, when play started.
 
         Tile.set_screen(self.screen)
+        Tile.set_backdrop(self.renderer.backdrop)
 
         self.create_grid()
 
+        # Fills the star once, when PROM is found.
+        self.engine.scoreboard.on_word("PROM", self.earn_star)
+
     def create_grid(self):
         # Creates a grid of tiles.
 
@@ -49,23 +107,28 @@ class Game:
             # -  row  : the list of letters within the self.board
 
             # Loads the images into surfaces, for this particular row.
-            imgNames = ["resources/" + letter + ".png" for letter in row]
-            # must be .convert_alpha() if using transparent image
-            imageSurfaces = [pygame.image.load(imgName).convert_alpha() for imgName in imgNames]
+            # Each letter is only loaded once, even if it is on the board more than once.
+            imageSurfaces = [assets.letter(letter) for letter in row]
 
             # Creates each row in the grid.
             new_row = self.create_row(rowNum, imageSurfaces, row)
             self.grid.append(new_row)
 
-    def create_row(self, row_num, images, letters, size=4):
-        # Create one row in a grid. Each row contains size Tiles.
-        # required for calculating the tile's x,y coordinates on screen
-        #  -  row_num: the nth row of the grid being created
-        #  -   size  : the number of tiles in the row
-        #  -  images : a list of surfaces. should be same length or greater than size.
-        #  - letters : a list of one char strings to be stored in Tile. should be same length as images.
-        # returns the newly created row
-
+        # Maps mouse positions to tiles without checking every tile.
+        # Every tile's clickable rect sits at the same offset from its position, so the first tile's is used.
+        first = self.grid[0][0]
+        hit_rect = (first.rect.x - first.screen_position[0], first.rect.y - first.screen_position[1],
+                    first.rect.width, first.rect.height)
+        tile_width, tile_height = self.tile_size()
+        self.grid_index = GridIndex(self.board.rows, self.board.cols, Game.grid_origin,
+                                    (tile_height, tile_width), hit_rect)
+
+    def tile_size(self, size=None):
+        # Returns (tile_width, tile_height), the space given to each tile on a board with size tiles per row.
+        #  - size : defaults to the number of rows or columns in self.board, whichever is bigger,
+        #           so that the whole board fits in the same square on the left of the screen.
+        if size is None:
+            size = max(self.board.rows, self.board.cols)
         # Padding for the overall board.
         top_pad, bottom_pad, left_pad, right_pad = 30, 30, 30, 30
 
@@ -73,12 +136,23 @@ class Game:
         # previously, self.screen.get_height()
         tile_width = (640 - left_pad - right_pad) // size
         tile_height = (640 - top_pad - bottom_pad) // size
+        return tile_width, tile_height
+
+    def create_row(self, row_num, images, letters, size=None):
+        # Create one row in a grid. Each row contains one Tile per letter.
+        # required for calculating the tile's x,y coordinates on screen
+        #  -  row_num: the nth row of the grid being created
+        #  -   size  : the number of tiles that fit across the board. Defaults to the size of self.board.
+        #  -  images : a list of surfaces. should be same length or greater than size.
+        #  - letters : a list of one char strings to be stored in Tile. should be same length as images.
+        # returns the newly created row
+
+        tile_width, tile_height = self.tile_size(size)
 
         new_row = []
-        for i in range(4):
+        for i in range(len(letters)):
             # Padding between each tile .
-            x_pad = 30
-            y_pad = 30
+            x_pad, y_pad = Game.grid_origin
             pos = (i * tile_height + x_pad, row_num * tile_width + y_pad)
             content = images[i]
             letter = letters[i]
@@ -90,217 +164,309 @@ class Game:
         return new_row
 
     def play(self):
-        # There doesn't seem to be a function for mouseDrag,
-        # so the mousedown variable is used to keep track of when the mouse is dragged.
-        mousedown = False
-        current_tile_coords = ()  # The index (row, col) in self.grid for the tile currently being pressed/dragged.
-        pressed_tiles_coords = []  # Indices (row, col) in self.grid of all tiles that are pressed at the moment.
-        guess = ""  # The letters being dragged on the screen.
+        # There doesn't seem to be a function for mouseDrag, so the engine keeps track of the tiles being dragged.
+        engine = self.engine
         guess_text = ""  # The text to display as the current guess. Sometimes includes the points of the guess.
 
         # Draws the board once to set it up.
         self.draw()
+        self.started = time.perf_counter()
+        self.timer_length = engine.timer
         # Sets a timer by creating an event every second (1000 milliseconds).
         pygame.time.set_timer(pygame.USEREVENT, 1000)
 
         # Main game loop.
         while not self.close_clicked:
-            # This for loop handles events.
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.close_clicked = True
-
-                if event.type == pygame.USEREVENT:
-                    self.timer -= 1 if self.timer > 0 else 0
-
-                if self.continue_game:
-                    # Does things depending on if the tile is clicked or not.
-                    for rowNum, row in enumerate(self.grid):
-                        for colNum, tile in enumerate(row):
-                            # These if statements make the tile change to tile.secondary_color if the mouse is
-                            # pressed or dragged over the tile.
-                            if event.type == pygame.MOUSEBUTTONDOWN:
-                                mousedown = True
-                                # Always updates color if mouse is pressed on that tile.
-                                if tile.rect.collidepoint(event.pos):
-                                    current_tile_coords = tile.row, tile.col
-                                    pressed_tiles_coords.append(current_tile_coords)
-                                    guess = tile.letter
-                                    guess_text = f"{guess} (+{self.score(guess)})" if self.is_word(guess) else guess
-
-                            elif event.type == pygame.MOUSEBUTTONUP:
-                                if "PROM" in self.guessed_words:
-                                    self.prom_guessed = True
-
-                                # Handles the score.
-                                self.update_score(guess)
-                                # Resets color of all tiles to tile.main_color, as it loops thru.
-                                tile.draw()
-                                # Resets variables.
-                                mousedown = False
-                                current_tile_coords = ()
-                                pressed_tiles_coords = []
-                                guess = ""
-                                guess_text = ""
-                                tile.reset_covers()
-                                # Resets screen but keeps word and score labels.
-                                self.clear_screen()
-
-                            if event.type == pygame.MOUSEMOTION and mousedown:
-                                if tile.rect.collidepoint(event.pos) and tile.isTileNearby(current_tile_coords):
-                                    # Updates color if mouse is pressed and the previous tile clicked/dragged was nearby,
-                                    # and if the tile has not already been clicked.
-                                    if (tile.row, tile.col) not in pressed_tiles_coords:
-                                        current_tile_coords = tile.row, tile.col
-                                        pressed_tiles_coords.append(current_tile_coords)
-                                        guess += tile.letter
-                                        guess_text = f"{guess} (+{self.score(guess)})" if self.is_word(guess) else guess
-
-                    # This for loop updates the colors of the tiles accordingly.
-                    for row, col in pressed_tiles_coords:
-                        tile = self.grid[row][col]
-                        # Change the color, depending on what the guess is.
-                        if self.is_guessed_word(guess):
-                            tile.change_color(tile.yellow)
-                        elif self.is_word(guess):
-                            tile.change_color(tile.green)
-                        else:
-                            tile.change_color(tile.white)
-
-
-                    self.update_text(guess_text)
-
-            if self.prom_guessed:
-                self.star.fill_star()
-
-            if self.timer <= 0:
+            self.profiler.begin_frame()
+            with self.profiler.span("input"):
+                # This for loop handles events. Runs of mouse motion events are handled as one movement.
+                events = self.get_events()
+                for event in Game.coalesce_motion(events):
+                    if event.type == pygame.QUIT:
+                        self.close_clicked = True
+
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        self.toggle_profiler()
+
+                    if event.type == pygame.USEREVENT:
+                        engine.tick()
+
+                    if self.continue_game:
+                        # These if statements make the tile change color if the mouse is pressed or dragged over the tile.
+                        if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                            # Shows the player where the best word they have not found is, until they press a tile.
+                            if not engine.path:
+                                self.show_hint()
+
+                        if event.type == pygame.MOUSEBUTTONDOWN:
+                            self.reset_tiles(self.hint_path)
+                            self.hint_path = []
+                            # Finds the tile under the mouse (if any) from the grid geometry.
+                            cell = self.grid_index.lookup(event.pos)
+                            # Always updates color if mouse is pressed on a tile.
+                            if cell is not None and engine.press(*cell):
+                                guess_text = self.get_guess_text(engine.cursor)
+
+                        elif event.type == pygame.MOUSEBUTTONUP:
+                            pressed_tiles_coords = engine.path
+                            # Handles the score.
+                            engine.release()
+
+                            # Resets the pressed tiles. The rest of the screen has not changed.
+                            self.reset_tiles(pressed_tiles_coords)
+                            guess_text = ""
+
+                        elif event.type == pygame.MOUSEMOTION and engine.path:
+                            # Every tile the mouse passed over since the last event, in order, so that a fast drag
+                            # does not skip tiles. Each is added if it is next to the previous tile and not already used.
+                            # The run's positions are followed one segment at a time, so a curved drag stays curved.
+                            previous = self.pointer
+                            for pos in event.path:
+                                if previous is None:
+                                    cells = [self.grid_index.lookup(pos)]
+                                else:
+                                    cells = self.grid_index.cells_along(previous, pos)
+                                previous = pos
+                                for cell in cells:
+                                    if cell is not None and engine.drag(*cell):
+                                        guess_text = self.get_guess_text(engine.cursor)
+
+                    if hasattr(event, "pos"):
+                        self.pointer = event.pos
+
+            if self.continue_game:
+                with self.profiler.span("update"):
+                    # Change the color, depending on what the guess is. The cursor already knows, so no lookups.
+                    cursor = engine.cursor
+                    if cursor.is_found:
+                        color = Tile.yellow
+                    elif cursor.is_word:
+                        color = Tile.green
+                    else:
+                        color = Tile.white
+                    # Updates the colors of the tiles accordingly.
+                    self.highlight_path(engine.path, color)
+
+                    self.update_text(guess_text, self.get_guess_bg_color(cursor))
+
+            if engine.is_over:
                 self.continue_game = False
 
-            pygame.display.update()
+            if self.profiler.enabled:
+                self.draw_hud()
+
+            # Shows only the parts of the screen that changed this frame.
+            with self.profiler.span("display.update"):
+                self.renderer.present()
+            self.profiler.end_frame(len(events))
             self.game_Clock.tick(self.FPS)
 
-            if not self.continue_game and self.prom_guessed:
-                self.end()
+            if not self.continue_game:
+                with self.profiler.span("end"):
+                    self.end()
 
     def end(self):
-        # Changes the colors of the tiles in PROM.
-        # self.board = [
-        #     ["P", "R", "S", "U"],
-        #     ["E", "S", "O", "I"],
-        #     ["R", "M", "T", "R"],
-        #     ["D", "A", "P", "A"]
-        # ]
-        prom_coordinates = [(0, 0), (0, 1), (1, 2), (2, 1)]
-        for rowNum, row in enumerate(self.grid):
-            for colNum, tile in enumerate(row):
-                position = (rowNum, colNum)
-                if position in prom_coordinates:
-                    tile.change_color(tile.white)
-                    tile.change_color(tile.green)
+        # Shows each word the player missed on the board, one at a time, worth the most first.
+        # Runs every frame once the game is over.
+        if self.reveal_words is None:
+            self.reset_tiles(self.engine.path)
+            self.reset_tiles(self.hint_path)
+            self.reveal_words = iter(self.engine.index.missed())
+            if self.result_log is not None:
+                # Only queues the result. The log is written on another thread.
+                self.result_log.record(self.board, self.words, self.score_num, self.guessed_words,
+                                       self.timer_length, time.perf_counter() - self.started)
+
+        if self.reveal_frame % Game.reveal_frames == 0:
+            self.reset_tiles(self.reveal_path)
+            word = next(self.reveal_words, None)
+            if word is None:
+                self.reveal_path = []
+                self.update_text()
+            else:
+                self.reveal_path = self.engine.index.path(word)
+                self.highlight_path(self.reveal_path, Tile.green)
+                self.update_text(f"{word} (+{self.score(word)})", Tile.green)
+        self.reveal_frame += 1
+
+    def toggle_profiler(self):
+        # Turns the profiler and its on-screen HUD on or off.
+        if self.profiler.enabled:
+            self.profiler.disable()
+            self.renderer.remove_label("hud")
+        else:
+            self.profiler.enable([
+                (self, "draw", "draw"),
+                (self, "draw_text", "draw_text"),
+                (Tile, "change_color", "tile.change_color"),
+                (Tile, "draw", "tile.draw"),
+            ])
+
+    def draw_hud(self):
+        # Shows the last frame's time, event count and slowest stage in the top left corner of the right half.
+        self.renderer.label("hud", self.profiler.summary(), 640, 4, self.font.hud_font, background=self.white)
+
+    @staticmethod
+    def coalesce_motion(events):
+        # Yields the events in order, but each run of MOUSEMOTION events in a row as one: the last of the run,
+        # with the position of every event in the run, in order, as its path. The movement between the positions
+        # is not lost either: the tiles along the way are found with GridIndex.cells_along.
+        path = []
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                path.append(event)
+                continue
+            if path:
+                yield Game.motion_run(path)
+                path = []
+            yield event
+        if path:
+            yield Game.motion_run(path)
+
+    @staticmethod
+    def motion_run(motions):
+        # Returns the last of motions with a path attribute: the position of each of them, in order.
+        return pygame.event.Event(pygame.MOUSEMOTION, dict(motions[-1].dict, path=[motion.pos for motion in motions]))
+
+    def earn_star(self):
+        # Fills the star. Called once, when the word that earns the star is found.
+        self.prom_guessed = True
+        self.renderer.restore(self.star.rect)
+        self.star.fill_star()
+
+    def show_hint(self):
+        # Lights up the path of the word worth the most that has not been found yet.
+        self.reset_tiles(self.hint_path)
+        word = self.engine.index.hint()
+        self.hint_path = self.engine.index.path(word) if word is not None else []
+        self.highlight_path(self.hint_path, Tile.white)
+
+    def highlight_path(self, coords, color):
+        # Covers the tiles at coords, a list of (row, col), in color.
+        for row, col in coords:
+            tile = self.grid[row][col]
+            if tile.change_color(color):
+                self.renderer.mark(tile.draw_rect)
 
 
     def draw(self):
         # Draw all game objects, including background and tiles.
         # Only run once at the beginning.
 
-        self.screen.fill(self.bg_color)  # clear the display surface
-        # Places the background image on the screen. Note that it covers the background color.
-        self.screen.blit(self.bg, (0, 0))
+        # Clears the display surface and places the background image on the screen.
+        self.renderer.restore_all()
 
         for row in self.grid:
             for tile in row:
                 tile.draw()
 
         self.draw_text()
-        if not self.prom_guessed:
+        if self.prom_guessed:
+            self.star.fill_star()
+        else:
             self.star.draw()
 
-
         # updates screen
-        pygame.display.update()
+        self.renderer.present()
 
     def clear_screen(self):
         # Resets all surfaces on the screen, but keeps the words and score text labels the same.
         # Yes, I know it does the same thing as self.draw(). It used to do different things.
         self.draw()
 
-    def draw_text(self, guess_text=""):
+    def reset_tiles(self, coords):
+        # Removes the covers from the tiles at coords, a list of (row, col), and redraws only those tiles.
+        for row, col in coords:
+            tile = self.grid[row][col]
+            tile.reset_covers()
+            tile.draw()
+            self.renderer.mark(tile.draw_rect)
+
+    def draw_text(self, guess_text="", guess_bg_color=Tile.white):
         # Draws the text onto the screen.
         # Extra info:
         # The right half of the screen is 560x640, without the grid. Minus 30 px padding on all sides, 500 x 580.
         # The positioning of each line of text is done relative to the previous line.
+        # Labels that show the same thing as last time are not drawn again (see Renderer.label).
 
         middleX = 890  # the X value for the middle of the right half
         topY = 60
-        title = Text("Word Hunt", middleX, topY, self.font.title_font)
-        title.draw_centered(self.screen)
+        title = self.renderer.label("title", "Word Hunt", middleX, topY, self.font.title_font, centered=True)
 
         topY += title.size[1]
 
-        words = Text(f"WORDS: {self.word_num}", middleX - 150, topY, self.font.score_font)  # topY = 145
-        words.draw_left_aligned(self.screen)
+        # topY = 145
+        self.renderer.label("words", f"WORDS: {self.word_num}", middleX - 150, topY, self.font.score_font)
 
         topY += 60  # These numbers are added arbitrarily to add more space between the lines of text.
-        score = Text(f"SCORE:  {self.score_num}", middleX - 150, topY, self.font.score_font)  # topY = 205
-        score.draw_left_aligned(self.screen)
+        # topY = 205
+        self.renderer.label("score", f"SCORE:  {self.score_num}", middleX - 150, topY, self.font.score_font)
 
         topY += 100
-        # Processes the guess_text into just the guess, without the score part of the guess in the string.
-        temp = guess_text.split()[0] if len(guess_text.split()) > 0 else ""
-        bg_color = self.get_guess_bg_color(temp)
-        guess = Text(guess_text, middleX, topY, self.font.guess_font, background=bg_color)
-        guess.draw_centered(self.screen)
+        self.renderer.label("guess", guess_text, middleX, topY, self.font.guess_font,
+                            background=guess_bg_color, centered=True)
 
         rightX, bottomY = self.screen.get_size()
         countdown = f"{self.timer // 60}:{str(self.timer % 60).rjust(2, '0')}".rjust(3)
-        countdown_text = Text(countdown, rightX - 170, bottomY - 100, self.font.title_font, background=pygame.Color("white"))
-        countdown_text.draw_left_aligned(self.screen)
+        self.renderer.label("countdown", countdown, rightX - 170, bottomY - 100, self.font.title_font,
+                            background=pygame.Color("white"))
 
-    def get_guess_bg_color(self, guess):
+    def get_guess_bg_color(self, cursor):
+        # Returns the background color of the guess label for the guess followed by cursor (a GuessCursor).
         color = Tile.white
-        if self.is_guessed_word(guess):
+        if cursor.is_found:
             color = Tile.yellow
-        elif self.is_word(guess):
+        elif cursor.is_word:
             color = Tile.green
+        elif cursor.is_dead:
+            color = Game.dead_color
         return color
 
-    def update_text(self, guess=""):
+    def get_guess_text(self, cursor):
+        # Returns the text to display for the guess followed by cursor, including its points if it is a word.
+        return f"{cursor.text} (+{cursor.score})" if cursor.is_word else cursor.text
+
+    def update_text(self, guess="", guess_bg_color=Tile.white):
         # -  guess  : the word that the player is creating by dragging the mouse.
+        # - guess_bg_color : the background color of the guess label.
         # Yes, this function is an alias for self.draw_text(), but update_text makes more sense.
         # It is fine to redraw all the text, because the screen is cleared periodically when the game runs.
-        self.draw_text(guess)
+        self.draw_text(guess, guess_bg_color)
+
+    @property
+    def timer(self):
+        # The seconds left in the game.
+        return self.engine.timer
+
+    @property
+    def guessed_words(self):
+        # The set of self.words that have been guessed.
+        return self.engine.guessed_words
+
+    @property
+    def word_num(self):
+        # The number of words guessed correctly. Used in the label on screen.
+        return self.engine.word_num
+
+    @property
+    def score_num(self):
+        # The player's score. Used in the label on screen.
+        return self.engine.score_num
 
     def score(self, guess):
         # Returns an integer, score, for that particular word.
         # Returns 0 if the guess is not a proper guess.
         # - guess : the word for which to find the corresponding score
-
-        score = 0
-        if self.is_word(guess):
-            score = self.words[guess]
-        return score
+        return self.engine.score(guess)
 
     def update_score(self, guess):
         # Handles the score and updates the text on the screen with the score.
         # - guess : the word to use to find the corresponding score
-
-        score = self.score(guess)  # a local variable
-        if score > 0 and not self.is_guessed_word(guess):
-            self.guessed_words.append(guess)
-            self.score_num += score
-            self.word_num += 1
+        if self.engine.update_score(guess) > 0:
             self.update_text()
 
-
-
     def is_word(self, guess):
-        if guess in self.words:
-            return True
-        else:
-            return False
+        return self.engine.is_word(guess)
 
     def is_guessed_word(self, guess):
-        if guess in self.guessed_words:
-            return True
-        else:
-            return False
+        return self.engine.is_guessed_word(guess)
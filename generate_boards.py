@@ -0,0 +1,191 @@
+import argparse
+import heapq
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter
+from process_words import WordProcessor
+from compiled_words import CompiledDictionary
+from solver import Solver
+from solve_cache import SolveCache
+from scoring import ScoringRules
+
+
+# How often each letter appears in English words, in percent. Used to sample boards by default.
+english_letter_weights = {
+    "E": 12.0, "T": 9.1, "A": 8.1, "O": 7.7, "I": 7.3, "N": 7.0, "S": 6.3, "R": 6.0, "H": 5.9, "D": 4.3,
+    "L": 4.0, "U": 2.9, "C": 2.7, "M": 2.6, "F": 2.3, "Y": 2.1, "W": 2.1, "G": 2.0, "P": 1.8, "B": 1.5,
+    "V": 1.1, "K": 0.7, "X": 0.2, "Q": 0.1, "J": 0.2, "Z": 0.1,
+}
+
+# Set in each worker process by init_worker, so the dictionary is loaded once per process.
+worker_solver = None
+worker_cache = None  # (SolveCache, dictionary file name, ScoringRules) with --cache, or None.
+
+
+def letter_weights_from_dictionary(file_name):
+    # Returns letter : weight, counting how often each letter appears in the words of a dictionary.
+    counts = Counter()
+    if CompiledDictionary.is_compiled(file_name):
+        dictionary = CompiledDictionary(file_name)
+        for word, score in dictionary.words():
+            counts.update(word)
+        dictionary.close()
+    else:
+        with open(file_name, "r") as file:
+            for line in file:
+                line = line.split(";")[0].strip().upper()
+                if line.isalpha():
+                    counts.update(line)
+    return dict(counts)
+
+
+def sample_board(rng, size, letters, weights):
+    # Returns a size x size board of letters drawn at random with the given weights.
+    cells = rng.choices(letters, weights, k=size * size)
+    return [cells[row * size:(row + 1) * size] for row in range(size)]
+
+
+def rate_board(board, solutions):
+    # Returns the result record of a solved board. Only words worth points count, since the game accepts no others.
+    #  - difficulty : the average length of the words on the board. Boards with mostly short words are easier.
+    scored = [solution for solution in solutions.values() if solution.score > 0]
+    scores = [solution.score for solution in scored]
+    lengths = [len(solution.word) for solution in scored]
+    return {
+        "board": ["".join(row) for row in board],
+        "words": len(scored),
+        "score": sum(scores),
+        "difficulty": round(sum(lengths) / len(lengths), 3) if lengths else 0.0,
+    }
+
+
+def init_worker(dictionary_file, use_cache=False, rules=None):
+    # Loads the dictionary once in each worker process. With the solved board cache (see solve_cache.py),
+    # the cache loads it instead, and only once a board is not found in the cache.
+    # Random boards almost never repeat, so the cache only helps when the same seeds are sampled again.
+    global worker_solver, worker_cache
+    if use_cache:
+        worker_cache = (SolveCache(), dictionary_file, rules)
+    else:
+        worker_solver = Solver(WordProcessor.loadDictionary(dictionary_file, rules))
+
+
+def solve(board):
+    # Solves board in a worker, reading it from the cache if it was solved before with the same dictionary.
+    if worker_cache is None:
+        return worker_solver.solve(board)
+    cache, dictionary_file, rules = worker_cache
+    return cache.solve_file(board, dictionary_file, rules)
+
+
+def solve_batch(task):
+    # Samples and solves one batch of boards. Each batch has its own seed, so runs can be repeated.
+    #  - task : (seed, count, size, letters, weights)
+    seed, count, size, letters, weights = task
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        board = sample_board(rng, size, letters, weights)
+        record = rate_board(board, solve(board))
+        record["seed"] = seed
+        record["index"] = i
+        results.append(record)
+    return results
+
+
+def is_wanted(record, args):
+    # Checks if a board hits the targets given on the command line.
+    return (args.min_words <= record["words"] <= args.max_words
+            and args.min_score <= record["score"] <= args.max_score
+            and args.min_difficulty <= record["difficulty"] <= args.max_difficulty)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sample random boards, solve them in parallel, "
+                                                 "and keep the ones that hit the targets.")
+    parser.add_argument("dictionary", help="a text word list or compiled dictionary (see compiled_words.py)")
+    parser.add_argument("--count", type=int, default=10000, help="the number of boards to sample")
+    parser.add_argument("--size", type=int, default=4, help="the number of rows and columns on each board")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="the number of worker processes")
+    parser.add_argument("--batch", type=int, default=50, help="the number of boards in each worker task")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the first batch")
+    parser.add_argument("--letters-from-dictionary", action="store_true",
+                        help="sample letters as often as they appear in the dictionary, instead of in English")
+    parser.add_argument("--scoring", help="a JSON file of scoring rules (see scoring.ScoringRules)")
+    parser.add_argument("--cache", action="store_true",
+                        help="read and fill the solved board cache, e.g. to sample the same seeds again. Off by "
+                             "default: random boards do not repeat, so caching them is slower and evicts the "
+                             "boards the game reuses")
+    parser.add_argument("--min-words", type=int, default=0)
+    parser.add_argument("--max-words", type=int, default=sys.maxsize)
+    parser.add_argument("--min-score", type=int, default=0)
+    parser.add_argument("--max-score", type=int, default=sys.maxsize)
+    parser.add_argument("--min-difficulty", type=float, default=0.0)
+    parser.add_argument("--max-difficulty", type=float, default=float("inf"))
+    parser.add_argument("--output", default="boards.jsonl",
+                        help="where boards that hit the targets are written, one JSON object per line, as they finish")
+    parser.add_argument("--top", type=int, default=100, help="the number of best boards to rank")
+    parser.add_argument("--ranked", default=None,
+                        help="where the top boards are written, highest score first (default: <output>.ranked)")
+    args = parser.parse_args()
+
+    if args.letters_from_dictionary:
+        weights = letter_weights_from_dictionary(args.dictionary)
+    else:
+        weights = english_letter_weights
+    letters = sorted(weights)
+    weights = [weights[letter] for letter in letters]
+
+    rules = ScoringRules.from_file(args.scoring) if args.scoring else None
+
+    tasks = []
+    remaining = args.count
+    seed = args.seed
+    while remaining > 0:
+        count = min(args.batch, remaining)
+        tasks.append((seed, count, args.size, letters, weights))
+        remaining -= count
+        seed += 1
+
+    solved = 0
+    kept = 0
+    top = []  # A min-heap of (score, words, seed, index, record) of the best boards kept so far.
+    start = time.perf_counter()
+    with open(args.output, "w") as output, \
+            multiprocessing.Pool(args.workers, initializer=init_worker,
+                                 initargs=(args.dictionary, args.cache, rules)) as pool:
+        for results in pool.imap_unordered(solve_batch, tasks):
+            for record in results:
+                solved += 1
+                if not is_wanted(record, args):
+                    continue
+                kept += 1
+                output.write(json.dumps(record) + "\n")
+                entry = (record["score"], record["words"], record["seed"], record["index"], record)
+                if len(top) < args.top:
+                    heapq.heappush(top, entry)
+                elif entry[:4] > top[0][:4]:
+                    heapq.heapreplace(top, entry)
+            output.flush()
+            elapsed = time.perf_counter() - start
+            print(f"\r{solved}/{args.count} boards, {kept} kept, {solved / elapsed:.0f} boards/s",
+                  end="", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    ranked_file = args.ranked or args.output + ".ranked"
+    with open(ranked_file, "w") as ranked:
+        for rank, entry in enumerate(sorted(top, key=lambda entry: entry[:4], reverse=True), start=1):
+            ranked.write(json.dumps(dict(entry[4], rank=rank)) + "\n")
+
+    print(file=sys.stderr)
+    print(f"{solved} boards in {elapsed:.2f}s with {args.workers} workers: "
+          f"{solved / elapsed:.0f} boards/s, {solved / elapsed / args.workers:.0f} boards/s per core. "
+          f"{kept} kept in {args.output}, top {len(top)} in {ranked_file}.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+class GridIndex:
+    # Maps a position on the screen straight to the (row, col) of the tile under it, using the grid's geometry,
+    # instead of checking the position against every tile's rectangle.
+
+    def __init__(self, rows, cols, origin, cell_size, hit_rect):
+        #  -   rows    : the number of rows in the grid
+        #  -   cols    : the number of columns in the grid
+        #  -  origin   : the (x, y) screen position of the top left cell
+        #  - cell_size : (width, height) of one cell, i.e. the distance from one tile's position to the next
+        #  - hit_rect  : (x, y, width, height) of the clickable area inside a cell, relative to the cell's position.
+        #                Positions in a cell but outside this area (the gaps between tiles) are not on any tile.
+        self.rows = rows
+        self.cols = cols
+        self.left, self.top = origin
+        self.cell_width, self.cell_height = cell_size
+        hit_x, hit_y, hit_width, hit_height = hit_rect
+        self.hit_left, self.hit_top = hit_x, hit_y
+        self.hit_right, self.hit_bottom = hit_x + hit_width, hit_y + hit_height
+
+    def lookup(self, pos):
+        # Returns the (row, col) of the tile at pos, or None if pos is not on a tile.
+        #  - pos : (x, y) screen position, e.g. event.pos
+        x = pos[0] - self.left
+        y = pos[1] - self.top
+        if x < 0 or y < 0:
+            return None
+        col, cell_x = divmod(x, self.cell_width)
+        row, cell_y = divmod(y, self.cell_height)
+        if row >= self.rows or col >= self.cols:
+            return None
+        # Same edges as pygame.Rect.collidepoint: the right and bottom edges are outside.
+        if not (self.hit_left <= cell_x < self.hit_right and self.hit_top <= cell_y < self.hit_bottom):
+            return None
+        return int(row), int(col)
+
+    def cells_along(self, start, end):
+        # Returns the (row, col) of every tile whose clickable area the line from start to end passes through,
+        # in the order the line reaches them. Used so that a fast drag does not skip tiles between two events.
+        #  - start, end : (x, y) screen positions
+        x0, y0 = start[0] - self.left, start[1] - self.top
+        dx, dy = end[0] - start[0], end[1] - start[1]
+
+        # Only the cells in the line's bounding box can be crossed.
+        first_col = max(int(min(x0, x0 + dx) // self.cell_width), 0)
+        last_col = min(int(max(x0, x0 + dx) // self.cell_width), self.cols - 1)
+        first_row = max(int(min(y0, y0 + dy) // self.cell_height), 0)
+        last_row = min(int(max(y0, y0 + dy) // self.cell_height), self.rows - 1)
+
+        crossed = []  # (the fraction of the line where it enters the tile, (row, col))
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                left = col * self.cell_width + self.hit_left
+                top = row * self.cell_height + self.hit_top
+                right = col * self.cell_width + self.hit_right
+                bottom = row * self.cell_height + self.hit_bottom
+                enter = GridIndex.clip(x0, y0, dx, dy, left, top, right, bottom)
+                if enter is not None:
+                    crossed.append((enter, (row, col)))
+        crossed.sort()
+        return [cell for enter, cell in crossed]
+
+    @staticmethod
+    def clip(x0, y0, dx, dy, left, top, right, bottom):
+        # Returns the fraction (0 to 1) of the way along the line from (x0, y0) to (x0 + dx, y0 + dy)
+        # where it enters the rectangle, or None if it misses the rectangle. (Liang-Barsky line clipping.)
+        enter, leave = 0.0, 1.0
+        for p, q in ((-dx, x0 - left), (dx, right - x0), (-dy, y0 - top), (dy, bottom - y0)):
+            if p == 0:
+                if q < 0:
+                    return None
+            else:
+                t = q / p
+                if p < 0:
+                    enter = max(enter, t)
+                else:
+                    leave = min(leave, t)
+                if enter > leave:
+                    return None
+        return enter
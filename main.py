@@ -1,10 +1,17 @@
+import os
 import pygame
 from game import Game
+from recorder import InputRecorder
+from results import ResultLog, Leaderboard, board_hash
 
 
 def main():
 
-    pygame.init()
+    # Decode the images on other threads while the window opens.
+    Game.preload()
+    # Only the display (which also handles events and timers) and fonts are used, so the audio and joystick
+    # subsystems that pygame.init() would start are skipped.
+    pygame.display.init()
     pygame.font.init()
     # The screen size should be roughly (1200, 640).
     # The current dimensions (1150, 627) match the size of the background.png image.
@@ -16,11 +23,40 @@ def main():
     # Creates a game object.
     game = Game(screen)
 
+    # Set WORDHUNT_TRACE to a file name to profile the game from the start and save a Chrome trace when it closes.
+    trace_file = os.environ.get("WORDHUNT_TRACE")
+    if trace_file:
+        game.toggle_profiler()
+
+    # Set WORDHUNT_RECORD to a file name to record the game's input, to replay with recorder.py.
+    record_file = os.environ.get("WORDHUNT_RECORD")
+    if record_file:
+        recorder = InputRecorder(game)
+
+    # Finished games are saved to a log, with leaderboards for each board. Set WORDHUNT_RESULTS to use another file.
+    result_log = ResultLog(os.environ.get("WORDHUNT_RESULTS"))
+    game.result_log = result_log
+    # The scores of the games played on this board before, to compare this game's score with when it ends.
+    board = board_hash(game.board)
+    previous = result_log.scores(board)
+
     # start the main game loop by calling the play method on the game object
     game.play()
+    if record_file:
+        recorder.save(record_file)
+    if trace_file:
+        game.profiler.export_chrome_trace(trace_file)
     # quit pygame and clean up the pygame window
     pygame.quit()
-
+    # Waits for the result to be written after the window has closed.
+    result_log.close()
+    if not game.continue_game:
+        games = sum(previous.values())
+        if games:
+            print(f"Score {game.score_num}: better than {Leaderboard.percentile_of(game.score_num, previous):.0f}% "
+                  f"of {games} games on this board. Best: {max(max(previous), game.score_num)}.")
+        else:
+            print(f"Score {game.score_num}: the first game on this board.")
 
 if __name__ == "__main__":
     main()
@@ -1,18 +1,24 @@
 import os
+from solver import Trie, Solver
+from compiled_words import CompiledDictionary
+from scoring import default_rules
 
 
 class WordProcessor:
     @staticmethod
-    def readWordsFile(file_name):
+    def readWordsFile(file_name, rules=None):
+        # Reads a word list like words.txt (one word per line) into a dictionary of word : score.
+        # Words are scored by rules (a ScoringRules, default scoring.default_rules), not by the file.
+        # Older lists had a score line after each word. Those lines are skipped, so they are still read,
+        # and a missing score line can no longer shift the scores of the words after it.
         assert os.path.exists(file_name), "Cannot find the words file: %s" % (file_name)
+        rules = rules or default_rules
         file = open(file_name, "r")
         # A blank line signifies the end of the file.
         content = file.readlines() + ["\n"]
         file.close()
 
         accepted_words = {}
-        words = []  # Will be turned into the keys for accepted_words
-        scores = []  # Will be turned into the values for accepted_words
 
         for lineNum in range(len(content)):
             # Process each line that was in the level file.
@@ -26,13 +32,65 @@ class WordProcessor:
                 line = line[:line.find(";")]
 
             if line.isalpha():
-                words.append(line)
-            elif line.isnumeric():
-                scores.append(int(line))
-
-        # Processes words and scores into accepted_words dictionary.
-        for i in range(len(words)):
-            accepted_words[words[i]] = scores[i]
+                word = line.upper()
+                accepted_words[word] = rules.score(word)
 
         return accepted_words
 
+    @staticmethod
+    def readDictionaryFile(file_name, rules=None):
+        # Reads a plain word list (one word per line, like a full Scrabble dictionary) into a Trie.
+        # Unlike readWordsFile, blank lines are skipped rather than ending the file.
+        #  - rules : the ScoringRules that score the words. Defaults to scoring.default_rules.
+        assert os.path.exists(file_name), "Cannot find the dictionary file: %s" % (file_name)
+        trie = Trie(rules)
+        with open(file_name, "r") as file:
+            for line in file:
+                if ";" in line:
+                    # Ignore the ; lines, treat it as a comment
+                    line = line[:line.find(";")]
+                line = line.strip()
+                if line.isalpha():
+                    trie.insert(line)
+        return trie
+
+    @staticmethod
+    def hasScores(file_name):
+        # Checks if a word list is in the old format, with a score line after each word.
+        with open(file_name, "r") as file:
+            for line in file:
+                if ";" in line:
+                    line = line[:line.find(";")]
+                if line.strip().isnumeric():
+                    return True
+        return False
+
+    @staticmethod
+    def loadDictionary(file_name, rules=None):
+        # Loads a dictionary for the solver from either a compiled dictionary (see compiled_words.py),
+        # which is memory-mapped, or a text word list, which is read into a Trie.
+        #  - rules : the ScoringRules that score the words. Defaults to scoring.default_rules. A compiled dictionary
+        #            keeps the scores it was compiled with, so it must have been compiled with the same rules.
+        assert os.path.exists(file_name), "Cannot find the dictionary file: %s" % (file_name)
+        if CompiledDictionary.is_compiled(file_name):
+            dictionary = CompiledDictionary(file_name)
+            version = (rules or default_rules).version
+            assert dictionary.rules_version == version, \
+                "%s was compiled with scoring rules %s, not %s: compile it again with compiled_words.py --scoring" \
+                % (file_name, dictionary.rules_version, version)
+            return dictionary
+        if WordProcessor.hasScores(file_name):
+            return Trie.from_words(WordProcessor.readWordsFile(file_name, rules), rules)
+        return WordProcessor.readDictionaryFile(file_name, rules)
+
+    @staticmethod
+    def solveBoard(board, dictionary):
+        # Finds every accepted word on the board.
+        # Returns a dictionary of word : score, in the same format as readWordsFile, so it can be given to Game.
+        #  -    board   : a list of rows of letters, like Game.board
+        #  - dictionary : a Trie or CompiledDictionary (e.g. from loadDictionary),
+        #                 or a dictionary of word : score (e.g. from readWordsFile)
+        if isinstance(dictionary, dict):
+            dictionary = Trie.from_words(dictionary)
+        solutions = Solver(dictionary).solve(board)
+        return {word: solution.score for word, solution in solutions.items()}
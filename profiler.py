@@ -0,0 +1,122 @@
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+
+class Span:
+    # Times the code inside a with block and records it in the profiler.
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    # Times the stages of each frame (events, drawing, tiles, text, the display), for the on-screen HUD
+    # and for export as a Chrome trace (open chrome://tracing or https://ui.perfetto.dev and load the file).
+    # When disabled, span() returns a shared do-nothing context and no methods are wrapped, so it costs almost nothing.
+
+    null_span = nullcontext()
+
+    def __init__(self, max_spans=200000):
+        #  - max_spans : the most spans kept for the trace. The oldest are dropped first.
+        self.enabled = False
+        self.spans = deque(maxlen=max_spans)  # (name, start, end) in seconds, from time.perf_counter()
+        self.wrapped = []  # (owner, attribute name, the attribute before wrapping, if owner had its own) to undo
+        self.frame_start = None
+        self.frame_stages = {}  # stage name : seconds spent in it during the current frame
+        # Stats of the last finished frame, shown by the HUD.
+        self.frame_time = 0.0
+        self.event_count = 0
+        self.slowest_stage = ("", 0.0)
+
+    def enable(self, targets=()):
+        # Starts profiling.
+        #  - targets : (owner, method name, stage name) of methods to time. owner can be a class or an object.
+        if self.enabled:
+            return
+        self.enabled = True
+        for owner, method_name, stage in targets:
+            self.wrap(owner, method_name, stage)
+
+    def disable(self):
+        # Stops profiling and puts back every wrapped method. Recorded spans are kept for export.
+        self.enabled = False
+        for owner, method_name, own_attribute in reversed(self.wrapped):
+            if own_attribute is None:
+                delattr(owner, method_name)
+            else:
+                setattr(owner, method_name, own_attribute)
+        self.wrapped = []
+        self.frame_start = None
+
+    def wrap(self, owner, method_name, stage):
+        # Replaces owner.method_name with a version that records a span named stage each time it is called.
+        own_attribute = vars(owner).get(method_name)
+        method = getattr(owner, method_name)
+        profiler = self
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler.record(stage, start, time.perf_counter())
+
+        setattr(owner, method_name, timed)
+        self.wrapped.append((owner, method_name, own_attribute))
+
+    def span(self, name):
+        # Returns a context manager that times its with block as a stage called name.
+        if not self.enabled:
+            return Profiler.null_span
+        return Span(self, name)
+
+    def record(self, name, start, end):
+        self.spans.append((name, start, end))
+        if self.frame_start is not None:
+            self.frame_stages[name] = self.frame_stages.get(name, 0.0) + end - start
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+            self.frame_stages = {}
+
+    def end_frame(self, event_count=0):
+        # Finishes the frame's stats: its total time, how many events it handled, and its slowest stage.
+        if not self.enabled or self.frame_start is None:
+            return
+        end = time.perf_counter()
+        self.record("frame", self.frame_start, end)
+        self.frame_time = end - self.frame_start
+        self.event_count = event_count
+        stages = {name: seconds for name, seconds in self.frame_stages.items() if name != "frame"}
+        self.slowest_stage = max(stages.items(), key=lambda stage: stage[1], default=("", 0.0))
+        self.frame_start = None
+
+    def summary(self):
+        # Returns one line of text about the last frame, for the HUD.
+        name, seconds = self.slowest_stage
+        return (f"frame {self.frame_time * 1000:.2f} ms  events {self.event_count}  "
+                f"slowest {name} {seconds * 1000:.2f} ms")
+
+    def export_chrome_trace(self, file_name):
+        # Writes the recorded spans in the Chrome trace event format.
+        if not self.spans:
+            return
+        # Spans are recorded as they end, so an enclosing span comes after the spans inside it but starts first.
+        origin = min(start for name, start, end in self.spans)
+        events = [{"name": name, "ph": "X", "ts": (start - origin) * 1e6, "dur": (end - start) * 1e6,
+                   "pid": 1, "tid": 1} for name, start, end in self.spans]
+        with open(file_name, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,191 @@
+import argparse
+import os
+import struct
+import time
+import pygame
+
+
+class Recording:
+    # Everything needed to play a game again: the board, the timer, the input of every frame,
+    # and the final score and words, to check that the replay ended the same way.
+
+    def __init__(self, board, timer, events=None, score=0, words=()):
+        self.board = board  # A list of rows of letters.
+        self.timer = timer  # The length of the game in seconds.
+        self.events = events if events is not None else []  # (frame, milliseconds, code, x, y, extra)
+        self.score = score
+        self.words = sorted(words)
+
+
+class InputRecorder:
+    # Records the events a Game handles, frame by frame, into a compact binary file.
+    #
+    # File layout (little endian):
+    #   magic (8 bytes), version (u16), timer (u16), board length (u32), board (UTF-8: cells split by ",",
+    #   rows by "/"), event count (u32), events, final score (u32), words length (u32), words (UTF-8, split by "/").
+    #   Each event is: frame (u32), milliseconds since the start (u32), code (u8), x (i16), y (i16), extra (i32).
+
+    magic = b"WHREPLAY"
+    version = 1
+    event = struct.Struct("<IIBhhi")
+    # The event types that are recorded, and their code in the file. extra is the mouse button or key.
+    codes = {
+        pygame.QUIT: 1,
+        pygame.USEREVENT: 2,
+        pygame.MOUSEBUTTONDOWN: 3,
+        pygame.MOUSEBUTTONUP: 4,
+        pygame.MOUSEMOTION: 5,
+        pygame.KEYDOWN: 6,
+    }
+
+    def __init__(self, game):
+        # Starts recording everything the game handles from now on.
+        self.game = game
+        self.recording = Recording([list(row) for row in game.board], game.timer)
+        self.source = game.get_events
+        game.get_events = self.get_events
+        self.frame = 0
+        self.start = time.perf_counter()
+
+    def get_events(self):
+        # Gets the frame's events from the game's event source, records them, and passes them on.
+        events = self.source()
+        milliseconds = int((time.perf_counter() - self.start) * 1000)
+        for event in events:
+            code = InputRecorder.codes.get(event.type)
+            if code is None:
+                continue
+            x, y = getattr(event, "pos", (0, 0))
+            extra = getattr(event, "button", getattr(event, "key", 0))
+            self.recording.events.append((self.frame, milliseconds, code, x, y, extra))
+        self.frame += 1
+        return events
+
+    def save(self, file_name):
+        # Writes the recording, with the game's score and words as they are now, to file_name.
+        recording = self.recording
+        recording.score = self.game.score_num
+        recording.words = sorted(self.game.guessed_words)
+        board = "/".join(",".join(row) for row in recording.board).encode("utf-8")
+        words = "/".join(recording.words).encode("utf-8")
+        with open(file_name, "wb") as file:
+            file.write(InputRecorder.magic)
+            file.write(struct.pack("<HHI", InputRecorder.version, recording.timer, len(board)))
+            file.write(board)
+            file.write(struct.pack("<I", len(recording.events)))
+            for event in recording.events:
+                file.write(InputRecorder.event.pack(*event))
+            file.write(struct.pack("<II", recording.score, len(words)))
+            file.write(words)
+
+    @staticmethod
+    def load(file_name):
+        # Reads a recording saved by InputRecorder.save.
+        assert os.path.exists(file_name), "Cannot find the recording: %s" % (file_name)
+        with open(file_name, "rb") as file:
+            data = file.read()
+        assert data[:8] == InputRecorder.magic, "Not a recording: %s" % (file_name)
+        offset = 8
+        version, timer, board_length = struct.unpack_from("<HHI", data, offset)
+        assert version == InputRecorder.version, "Unsupported recording version: %d" % (version)
+        offset += 8
+        board = [row.split(",") for row in data[offset:offset + board_length].decode("utf-8").split("/")]
+        offset += board_length
+        count = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        events = list(InputRecorder.event.iter_unpack(data[offset:offset + count * InputRecorder.event.size]))
+        offset += count * InputRecorder.event.size
+        score, words_length = struct.unpack_from("<II", data, offset)
+        offset += 8
+        words = data[offset:offset + words_length].decode("utf-8")
+        return Recording(board, timer, events, score, words.split("/") if words else [])
+
+
+class InputReplayer:
+    # Feeds a recording back to a Game, frame by frame, in place of the real events.
+    # The real timer and window events are thrown away, so the game goes exactly as it did when recorded.
+
+    types = {code: event_type for event_type, code in InputRecorder.codes.items()}
+
+    def __init__(self, recording, real_time=False):
+        #  - real_time : if true, each frame waits until the time it was recorded at. Otherwise frames
+        #                run as fast as possible.
+        self.recording = recording
+        self.real_time = real_time
+        self.frames = {}  # frame : list of events
+        for frame, milliseconds, code, x, y, extra in recording.events:
+            self.frames.setdefault(frame, []).append((milliseconds, InputReplayer.make_event(code, x, y, extra)))
+        self.last_frame = max(self.frames, default=-1)
+        self.frame = 0
+        self.start = None
+
+    @staticmethod
+    def make_event(code, x, y, extra):
+        event_type = InputReplayer.types[code]
+        if event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            return pygame.event.Event(event_type, pos=(x, y), button=extra)
+        if event_type == pygame.MOUSEMOTION:
+            return pygame.event.Event(event_type, pos=(x, y), rel=(0, 0), buttons=(1, 0, 0))
+        if event_type == pygame.KEYDOWN:
+            return pygame.event.Event(event_type, key=extra)
+        return pygame.event.Event(event_type)
+
+    def attach(self, game):
+        # Makes game read its events from the recording.
+        game.get_events = self.get_events
+        if not self.real_time:
+            game.FPS = 0  # No frame rate limit.
+
+    def get_events(self):
+        # Returns the recorded events of the next frame. Ends the game after the last recorded frame.
+        if self.start is None:
+            self.start = time.perf_counter()
+        pygame.event.pump()
+        pygame.event.clear()
+        if self.frame > self.last_frame:
+            return [pygame.event.Event(pygame.QUIT)]
+        frame = self.frames.get(self.frame, [])
+        self.frame += 1
+        if self.real_time and frame:
+            delay = frame[0][0] / 1000 - (time.perf_counter() - self.start)
+            if delay > 0:
+                time.sleep(delay)
+        return [event for milliseconds, event in frame]
+
+    @staticmethod
+    def replay(screen, file_name, real_time=False):
+        # Plays a recorded game again. Returns the finished Game and whether it ended with the recorded score and words.
+        from game import Game
+
+        recording = InputRecorder.load(file_name)
+        game = Game(screen, recording.board)
+        game.engine.timer = recording.timer
+        InputReplayer(recording, real_time).attach(game)
+        game.play()
+        matches = game.score_num == recording.score and sorted(game.guessed_words) == recording.words
+        return game, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a game recorded with WORDHUNT_RECORD=<file> python main.py")
+    parser.add_argument("recording", help="the recording to replay")
+    parser.add_argument("--real-time", action="store_true", help="replay at the recorded speed, in a window")
+    args = parser.parse_args()
+
+    if not args.real_time:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((1150, 627))
+    pygame.display.set_caption('Word Hunt')
+    start = time.perf_counter()
+    game, matches = InputReplayer.replay(screen, args.recording, args.real_time)
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+    print(f"Score {game.score_num}, {game.word_num} words, in {elapsed:.3f}s. "
+          f"{'Matches' if matches else 'Does NOT match'} the recording.")
+    if not matches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import pygame
+from font import Text
+
+
+class Renderer:
+    # Keeps track of which parts of the screen changed since the last frame, so that only those parts are
+    # redrawn and sent to the display, instead of the whole window every frame.
+
+    def __init__(self, screen, background, bg_color):
+        #  -   screen   : the display window surface object
+        #  - background : the background image surface, drawn at (0, 0)
+        #  -  bg_color  : the color under the background image
+        self.screen = screen
+        # What is behind everything else: bg_color with the background image on top. Drawn once, so that
+        # restoring a part of the screen is a single blit.
+        self.backdrop = pygame.Surface(screen.get_size()).convert()
+        self.backdrop.fill(bg_color)
+        self.backdrop.blit(background, (0, 0))
+        self.dirty = []  # Rects of the screen that changed since the last present().
+        self.full = False  # When this is true, the whole screen is sent to the display on the next present().
+        self.labels = {}  # name : (key, Text, rect) of each text label on the screen.
+
+    def mark(self, rect):
+        # Marks a part of the screen as changed.
+        self.dirty.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        # Marks the whole screen as changed, e.g. after Game.draw().
+        self.full = True
+
+    def restore(self, rect):
+        # Draws the background over a part of the screen, erasing whatever was there, and marks it as changed.
+        rect = pygame.Rect(rect)
+        self.screen.blit(self.backdrop, rect, rect)
+        self.mark(rect)
+
+    def restore_all(self):
+        # Draws the background over the whole screen. Every label will be drawn again on its next label() call.
+        self.screen.blit(self.backdrop, (0, 0))
+        self.labels = {}
+        self.mark_all()
+
+    def label(self, name, text, x, y, font, color=(0, 0, 0), background=None, centered=False):
+        # Draws a text label, unless the label with this name already shows the same thing.
+        # Returns the Text, which can be used to position other labels.
+        #  -   name   : identifies the label, e.g. "score"
+        #  -  centered: if true, (x, y) is the center of the label. Otherwise it is the top left.
+        key = (text, x, y, font, tuple(color), None if background is None else tuple(background))
+        previous = self.labels.get(name)
+        if previous is not None and previous[0] == key:
+            return previous[1]
+
+        if previous is not None:
+            # Erases the old label, which might be bigger than the new one.
+            self.restore(previous[2])
+
+        label = Text(text, x, y, font, color, background)
+        if centered:
+            rect = pygame.Rect(x - label.size[0] // 2, y - label.size[1] // 2, *label.size)
+            label.draw_centered(self.screen)
+        else:
+            rect = pygame.Rect(x, y, *label.size)
+            label.draw_left_aligned(self.screen)
+        self.mark(rect)
+        self.labels[name] = (key, label, rect)
+        return label
+
+    def remove_label(self, name):
+        # Erases the label with this name, if it is on the screen.
+        previous = self.labels.pop(name, None)
+        if previous is not None:
+            self.restore(previous[2])
+
+    def present(self):
+        # Sends the changed parts of the screen to the display.
+        if self.full:
+            pygame.display.update()
+        elif self.dirty:
+            pygame.display.update(self.dirty)
+        self.dirty = []
+        self.full = False
@@ -0,0 +1,342 @@
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from user_dirs import data_file
+
+
+def board_hash(board):
+    # Returns a short hash of a board's letters, the same for every game on that board.
+    #  - board : a Board, or a list of rows of letters
+    letters = "/".join(",".join(letter.upper() for letter in row) for row in board)
+    return hashlib.sha1(letters.encode("utf-8")).hexdigest()[:16]
+
+
+class BoardRecord:
+    # The totals of every game played on one board, kept up to date as each game is added.
+    __slots__ = ("board", "words", "games", "total_score", "scores", "top", "found")
+
+    def __init__(self, board, words):
+        #  - board : the board's rows, as strings
+        #  - words : word : score of every word that can be found on the board
+        self.board = board
+        self.words = words
+        self.games = 0
+        self.total_score = 0
+        self.scores = Counter()  # score : the number of games that ended with it
+        self.top = []  # [-score, finished at, words found] of the best games, best first
+        self.found = Counter()  # word : the number of games it was found in
+
+    def to_json(self):
+        return {"board": self.board, "words": self.words, "games": self.games, "total_score": self.total_score,
+                "scores": {str(score): count for score, count in self.scores.items()}, "top": self.top,
+                "found": dict(self.found)}
+
+    @classmethod
+    def from_json(cls, data):
+        record = cls(data["board"], data["words"])
+        record.games = data["games"]
+        record.total_score = data["total_score"]
+        record.scores = Counter({int(score): count for score, count in data["scores"].items()})
+        record.top = data["top"]
+        record.found = Counter(data["found"])
+        return record
+
+
+class Leaderboard:
+    # Leaderboards and per-board statistics, updated one game at a time, so a query never has to read the log.
+
+    def __init__(self, top_size=10):
+        #  - top_size : the number of best games kept for each board, and for all boards together
+        self.top_size = top_size
+        self.boards = {}  # board hash : BoardRecord
+        self.games = 0
+        self.top = []  # [-score, finished at, board hash, words found] of the best games on any board, best first
+
+    def add_board(self, entry):
+        # Adds a board log entry: {"type": "board", "hash", "board", "words"}. Boards already known are ignored.
+        if entry["hash"] not in self.boards:
+            self.boards[entry["hash"]] = BoardRecord(entry["board"], entry["words"])
+
+    def add_game(self, entry):
+        # Adds a game log entry (see ResultLog.record). Games on a board that was never added are ignored.
+        record = self.boards.get(entry["hash"])
+        if record is None:
+            return
+        score, found, finished = entry["score"], entry["found"], entry["finished"]
+        record.games += 1
+        record.total_score += score
+        record.scores[score] += 1
+        record.found.update(found)
+        self.games += 1
+        Leaderboard.insert_top(record.top, [-score, finished, len(found)], self.top_size)
+        Leaderboard.insert_top(self.top, [-score, finished, entry["hash"], len(found)], self.top_size)
+
+    @staticmethod
+    def insert_top(top, row, size):
+        # Keeps top sorted (best score first, then earliest) and at most size long.
+        if len(top) < size or row < top[-1]:
+            bisect.insort(top, row)
+            del top[size:]
+
+    def leaders(self, board=None, count=None):
+        # Returns (score, finished at, words found) of the best games, best first, on one board (a board hash)
+        # or, with board None, on every board (then with the board hash too, before the words found).
+        top = self.boards[board].top if board is not None else self.top
+        return [(-row[0],) + tuple(row[1:]) for row in top[:count]]
+
+    def percentile(self, score, board):
+        # Returns the percentage of games on board (a board hash) that scored less than score.
+        return Leaderboard.percentile_of(score, self.scores(board))
+
+    @staticmethod
+    def percentile_of(score, scores):
+        # Returns the percentage of games in scores (score : the number of games) that scored less than score.
+        games = sum(scores.values())
+        if not games:
+            return 100.0
+        return 100 * sum(count for other, count in scores.items() if other < score) / games
+
+    def scores(self, board):
+        # Returns a copy of score : the number of games that ended with it, on board (a board hash).
+        record = self.boards.get(board)
+        return Counter(record.scores) if record is not None else Counter()
+
+    def most_missed(self, board, count=10):
+        # Returns (word, the fraction of games it was missed in) of the words on board most often missed,
+        # worth the most first when as often missed.
+        record = self.boards[board]
+        if not record.games:
+            return []
+        words = sorted(record.words, key=lambda word: (record.found[word], -record.words[word], word))
+        return [(word, 1 - record.found[word] / record.games) for word in words[:count]]
+
+    def stats(self, board):
+        # Returns a dictionary of a board's totals.
+        record = self.boards[board]
+        return {"board": record.board, "games": record.games, "words": len(record.words),
+                "average_score": record.total_score / record.games if record.games else 0.0,
+                "best_score": -record.top[0][0] if record.top else 0}
+
+    def to_json(self):
+        return {"top_size": self.top_size, "games": self.games, "top": self.top,
+                "boards": {key: record.to_json() for key, record in self.boards.items()}}
+
+    @classmethod
+    def from_json(cls, data):
+        leaderboard = cls(data["top_size"])
+        leaderboard.games = data["games"]
+        leaderboard.top = data["top"]
+        leaderboard.boards = {key: BoardRecord.from_json(record) for key, record in data["boards"].items()}
+        return leaderboard
+
+
+class ResultLog:
+    # Keeps the result of every finished game in an append-only log, one JSON object per line, and a Leaderboard
+    # of them. record() only queues the result: a background thread writes the queue to the log in batches and
+    # updates the Leaderboard, so ending a game costs the frame nothing.
+    #
+    # The Leaderboard is saved next to the log (<log>.summary) with the length of the log it covers, so
+    # opening the log only reads what was added after the last save (e.g. after a crash), not the whole log.
+    #
+    # Log entries:
+    #   {"type": "board", "hash", "board", "words"}   The first time a board is played: its words and their scores.
+    #   {"type": "game", "hash", "score", "found", "timer", "duration", "finished"}
+    #       found is the words found, timer the length of the game and duration the seconds it was played for.
+
+    def __init__(self, file_name=None, top_size=10, batch_interval=0.5):
+        #  -    file_name   : the log. Defaults to ~/.local/share/wordhunt/results.jsonl
+        #  - batch_interval : the longest a result waits in the queue, in seconds, so results that arrive
+        #                     together (e.g. from a server) are written together
+        if file_name is None:
+            file_name = data_file("results.jsonl")
+        self.file_name = file_name
+        self.summary_file = file_name + ".summary"
+        self.batch_interval = batch_interval
+        self.lock = threading.Lock()  # Held while the Leaderboard changes, and by queries.
+        self.leaderboard, self.offset = self.load(top_size)  # offset: the length of the log it covers
+        self.known_boards = set(self.leaderboard.boards)  # Boards whose entry is in the log or in the queue.
+        self.unwritten = {}  # board hash : its board entry, taken from the queue but not yet in the log
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.write_loop, name="results", daemon=True)
+        self.thread.start()
+
+    def load(self, top_size):
+        # Returns the saved Leaderboard and the length of log it covers, updated with any entries after that.
+        leaderboard, offset = Leaderboard(top_size), 0
+        try:
+            with open(self.summary_file, "r") as file:
+                summary = json.load(file)
+            leaderboard, offset = Leaderboard.from_json(summary["leaderboard"]), summary["offset"]
+        except (OSError, ValueError, KeyError):
+            pass
+        if not os.path.exists(self.file_name):
+            return Leaderboard(top_size), 0
+        if offset > os.path.getsize(self.file_name):
+            # The log was replaced: the summary is not about it.
+            leaderboard, offset = Leaderboard(top_size), 0
+        return leaderboard, self.read_from(leaderboard, offset)
+
+    def read_from(self, leaderboard, offset):
+        # Adds the log's entries from offset on to leaderboard. Returns the offset after the last whole line.
+        with open(self.file_name, "rb") as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break  # Cut off by a crash. The next write starts a new line after it.
+                offset += len(line)
+                try:
+                    ResultLog.apply(leaderboard, json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    continue  # The end of a line cut off by a crash, or an entry from a different version.
+        return offset
+
+    @staticmethod
+    def apply(leaderboard, entry):
+        if entry["type"] == "board":
+            leaderboard.add_board(entry)
+        elif entry["type"] == "game":
+            leaderboard.add_game(entry)
+
+    def record(self, board, words, score, found, timer, duration):
+        # Queues a finished game. Returns at once; the log is written by the background thread.
+        #  -  board   : the board, as a Board or list of rows
+        #  -  words   : word : score of the words on the board (only words worth points are kept)
+        #  -  found   : the words found
+        #  -  timer   : the length of the game, in seconds
+        #  - duration : the seconds the game was played for
+        key = board_hash(board)
+        if key not in self.known_boards:
+            self.known_boards.add(key)
+            self.queue.put({"type": "board", "hash": key, "board": ["".join(row) for row in board],
+                            "words": {word: score for word, score in words.items() if score > 0}})
+        self.queue.put({"type": "game", "hash": key, "score": score, "found": sorted(found), "timer": timer,
+                        "duration": round(duration, 3), "finished": round(time.time(), 3)})
+        return key
+
+    def write_loop(self):
+        # Runs on the background thread: waits for an entry, gathers whatever else arrives within batch_interval,
+        # and appends them to the log in one write.
+        closing = False
+        while not closing:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.batch_interval
+            while batch[-1] is not None:
+                try:
+                    batch.append(self.queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                closing = True
+                batch.pop()
+            if batch:
+                self.write(batch)
+
+    def write(self, batch):
+        # A board entry is held back until the first game on its board, and written just before it, in the
+        # same write. If that write fails, it is held back again, so the log never has a game without its board.
+        entries = []
+        for entry in batch:
+            if entry["type"] == "board":
+                self.unwritten[entry["hash"]] = entry
+                continue
+            board = self.unwritten.pop(entry["hash"], None)
+            if board is not None:
+                entries.append(board)
+            entries.append(entry)
+        if not entries:
+            return
+        data = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries).encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.file_name)), exist_ok=True)
+            with open(self.file_name, "ab") as file:
+                if file.tell() != self.offset:
+                    # Another process added games since (they are counted first), or a crash cut the last
+                    # line off (it is ended, so the new entries start on their own line).
+                    with self.lock:
+                        self.offset = self.read_from(self.leaderboard, self.offset)
+                    if file.tell() != self.offset:
+                        data = b"\n" + data
+                file.write(data)
+                self.offset = file.tell()
+        except OSError:
+            # The game goes on without its result saved.
+            for entry in entries:
+                if entry["type"] == "board":
+                    self.unwritten[entry["hash"]] = entry
+            return
+        with self.lock:
+            for entry in entries:
+                ResultLog.apply(self.leaderboard, entry)
+
+    def close(self):
+        # Writes everything still queued, then saves the Leaderboard so the next load does not read the log again.
+        self.queue.put(None)
+        self.thread.join()
+        with self.lock:
+            summary = {"offset": self.offset, "leaderboard": self.leaderboard.to_json()}
+        try:
+            with open(self.summary_file + ".tmp", "w") as file:
+                json.dump(summary, file, separators=(",", ":"))
+            os.replace(self.summary_file + ".tmp", self.summary_file)
+        except OSError:
+            pass
+
+    # Queries. Each holds the lock only while reading the Leaderboard.
+
+    def leaders(self, board=None, count=None):
+        with self.lock:
+            return self.leaderboard.leaders(board, count)
+
+    def percentile(self, score, board):
+        with self.lock:
+            return self.leaderboard.percentile(score, board)
+
+    def scores(self, board):
+        with self.lock:
+            return self.leaderboard.scores(board)
+
+    def most_missed(self, board, count=10):
+        with self.lock:
+            return self.leaderboard.most_missed(board, count)
+
+    def stats(self, board):
+        with self.lock:
+            return self.leaderboard.stats(board)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the leaderboards of the games saved by main.py.")
+    parser.add_argument("--log", help="the results log (default: ~/.local/share/wordhunt/results.jsonl)")
+    parser.add_argument("--board", help="a board, rows split by / (e.g. PRSU/ESOI/RMTR/DAPA), or its hash")
+    parser.add_argument("--top", type=int, default=10, help="the number of games and words to show")
+    args = parser.parse_args()
+
+    log = ResultLog(args.log)
+    key = None
+    if args.board:
+        key = args.board if args.board in log.leaderboard.boards else board_hash(args.board.split("/"))
+        if key not in log.leaderboard.boards:
+            raise SystemExit("No games on that board.")
+        stats = log.stats(key)
+        print(f"Board {'/'.join(stats['board'])}: {stats['games']} games, {stats['words']} words, "
+              f"average score {stats['average_score']:.0f}, best {stats['best_score']}")
+        for rank, (score, finished, found) in enumerate(log.leaders(key, args.top), start=1):
+            finished = time.strftime("%Y-%m-%d %H:%M", time.localtime(finished))
+            print(f"{rank:3}. {score:7} points, {found:3} words, {finished}")
+        print("Most missed: " + ", ".join(f"{word} ({missed:.0%})" for word, missed in log.most_missed(key, args.top)))
+    else:
+        print(f"{log.leaderboard.games} games on {len(log.leaderboard.boards)} boards")
+        for rank, (score, finished, board, found) in enumerate(log.leaders(None, args.top), start=1):
+            print(f"{rank:3}. {score:7} points, {found:3} words, board "
+                  f"{'/'.join(log.leaderboard.boards[board].board)}")
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from collections import Counter
+
+
+class Scoreboard:
+    # The words a player has found and their totals. Each new word updates every total in O(1),
+    # and achievements are triggers that fire once, when their word is found, instead of being checked every frame.
+
+    def __init__(self, words):
+        #  - words : dictionary of accepted words : score. Words worth no points can never be found.
+        self.total_words = sum(1 for score in words.values() if score > 0)  # The number of words that can be found.
+        self.total_score = sum(score for score in words.values() if score > 0)  # The best possible score.
+        self.found = set()  # The words found.
+        self.found_order = []  # The words found, in the order they were found.
+        self.word_num = 0  # The number of words found.
+        self.score_num = 0  # The player's score.
+        self.found_by_length = Counter()  # length : the number of words of that length found
+        self.triggers = {}  # word : list of functions to call once when that word is found
+        self.listeners = []  # Functions called with (word, score) whenever any word is found.
+
+    @property
+    def completion(self):
+        # The percentage of the words on the board that have been found.
+        return 100 * self.word_num / self.total_words if self.total_words else 100.0
+
+    def add(self, word, score):
+        # Records a newly found word. Returns False (and changes nothing) if the word was already found
+        # or is worth no points.
+        if score <= 0 or word in self.found:
+            return False
+        self.found.add(word)
+        self.found_order.append(word)
+        self.word_num += 1
+        self.score_num += score
+        self.found_by_length[len(word)] += 1
+
+        for listener in self.listeners:
+            listener(word, score)
+        for trigger in self.triggers.pop(word, ()):
+            trigger()
+        return True
+
+    def on_word(self, word, trigger):
+        # Calls trigger() once, when word is found. If word has already been found, trigger is called now.
+        if word in self.found:
+            trigger()
+        else:
+            self.triggers.setdefault(word, []).append(trigger)
+
+    def on_any_word(self, listener):
+        # Calls listener(word, score) every time a new word is found.
+        self.listeners.append(listener)
+
+    def __contains__(self, word):
+        return word in self.found
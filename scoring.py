@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+from array import array
+
+
+class ScoringRules:
+    # How a word is scored, worked out from the word itself rather than stored next to it in the word list.
+    #
+    # score = (length score + the bonus of each letter) * the multiplier of each letter * multiplier
+    # Words whose length score is 0 (too short) are worth nothing, whatever their letters.
+
+    # Word Hunt scoring, indexed by word length. Words longer than the table get extra_letter more per extra letter.
+    default_length_scores = (0, 0, 0, 100, 400, 800, 1400, 1800, 2200)
+
+    def __init__(self, length_scores=default_length_scores, extra_letter=400, letter_bonuses=None,
+                 letter_multipliers=None, multiplier=1):
+        #  -   length_scores    : the score of a word of each length, indexed by length
+        #  -   extra_letter     : the points for each letter past the end of length_scores
+        #  -  letter_bonuses    : letter : points added for each time the letter is in the word, e.g. {"Z": 100}
+        #  - letter_multipliers : letter : the score is multiplied by this for each time the letter is in the word
+        #  -    multiplier      : the whole score is multiplied by this, e.g. for a double points round
+        self.length_scores = tuple(length_scores)
+        self.extra_letter = extra_letter
+        self.letter_bonuses = {letter.upper(): bonus for letter, bonus in (letter_bonuses or {}).items()}
+        self.letter_multipliers = {letter.upper(): factor for letter, factor in (letter_multipliers or {}).items()}
+        self.multiplier = multiplier
+
+    def length_score(self, length):
+        # Returns the score of a word of length letters, before bonuses and multipliers.
+        if length < len(self.length_scores):
+            return self.length_scores[length]
+        return self.length_scores[-1] + self.extra_letter * (length - len(self.length_scores) + 1)
+
+    def score(self, word):
+        # Returns the score of word (in all caps).
+        score = self.length_score(len(word))
+        if score <= 0:
+            return 0
+        factor = self.multiplier
+        if self.letter_bonuses or self.letter_multipliers:
+            for letter in word:
+                score += self.letter_bonuses.get(letter, 0)
+                factor *= self.letter_multipliers.get(letter, 1)
+        return int(score * factor)
+
+    def settings(self):
+        # Returns the rules as a dictionary, the same as read by from_file.
+        return {"length_scores": list(self.length_scores), "extra_letter": self.extra_letter,
+                "letter_bonuses": self.letter_bonuses, "letter_multipliers": self.letter_multipliers,
+                "multiplier": self.multiplier}
+
+    @property
+    def version(self):
+        # A short hash of the rules. Changes whenever any word's score could change.
+        text = json.dumps(self.settings(), sort_keys=True)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+    @classmethod
+    def from_file(cls, file_name):
+        # Reads rules from a JSON file with any of the keys of settings(). Missing keys keep their defaults.
+        assert os.path.exists(file_name), "Cannot find the scoring rules: %s" % (file_name)
+        with open(file_name, "r") as file:
+            return cls(**json.load(file))
+
+
+# The rules used when none are given.
+default_rules = ScoringRules()
+
+
+class ScoreTable:
+    # The score of every word in a dictionary, worked out once when the dictionary loads,
+    # in a compact array indexed by word id (the order the words were added in).
+
+    def __init__(self, rules=None):
+        self.rules = rules or default_rules
+        self.scores = array("l")  # word id : score
+
+    def add(self, word, score=None):
+        # Gives word the next word id and returns it.
+        #  - score : the word's score. If None, it is scored by self.rules.
+        self.scores.append(self.rules.score(word) if score is None else score)
+        return len(self.scores) - 1
+
+    def __getitem__(self, word_id):
+        return self.scores[word_id]
+
+    def __setitem__(self, word_id, score):
+        self.scores[word_id] = score
+
+    def __len__(self):
+        return len(self.scores)
@@ -0,0 +1,361 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import random
+import time
+from board import Board
+from scoreboard import Scoreboard
+from solver import Solver
+from process_words import WordProcessor
+from solve_cache import SolveCache
+from scoring import ScoringRules
+from generate_boards import english_letter_weights, sample_board
+
+
+# Protocol: one JSON object per line, in both directions, over a plain TCP connection.
+#
+# Client to server:
+#   {"type": "join", "match": <match name>, "name": <player name>}   Joins (or starts) the match with that name.
+#   {"type": "path", "path": [[row, col], ...]}                       Guesses the word along path.
+#   {"type": "leave"}                                                 Leaves the match and closes the connection.
+#
+# Server to client:
+#   {"type": "welcome", "player": id, "match": name, "board": [row, ...], "time_left": seconds,
+#    "total_words": n, "players": {id: name}}
+#   {"type": "joined", "player": id, "name": name}                    Sent to everyone in the match.
+#   {"type": "left", "player": id}                                    Sent to everyone in the match.
+#   {"type": "word", "player": id, "word": word, "score": points, "total": score}  Sent to everyone in the match.
+#   {"type": "rejected", "path": path, "reason": text}               Sent only to the player who guessed.
+#   {"type": "end", "scores": [[id, name, score, words], ...]}        Sent to everyone when the timer runs out.
+#                                                                     Players can then join another match.
+#   {"type": "error", "reason": text}
+
+
+class Connection:
+    # One connected player. Messages sent to it wait in self.outbox until the server flushes every
+    # connection at once, so a burst of events costs each socket one write instead of one per event.
+
+    __slots__ = ("server", "reader", "writer", "id", "name", "match", "scoreboard", "outbox", "closed")
+
+    def __init__(self, server, reader, writer, player_id):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.id = player_id
+        self.name = ""
+        self.match = None  # The Match joined, or None.
+        self.scoreboard = None  # This player's words and score in self.match.
+        self.outbox = []  # Encoded lines waiting for the next flush.
+        self.closed = False
+
+    def send(self, line):
+        # Queues an encoded line (see MatchServer.encode) to be written at the next flush.
+        if self.closed:
+            return
+        if not self.outbox:
+            self.server.queue_flush(self)
+        self.outbox.append(line)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.outbox.clear()
+            self.writer.close()
+
+
+class Match:
+    # Several players racing on one board. The board is solved once, when the match starts, and every
+    # guess is checked against that solution. Each player has their own Scoreboard, so a word found by
+    # one player can still be found by the others.
+
+    def __init__(self, server, name, board, words, timer):
+        #  - board : a Board
+        #  - words : dictionary of word : score, every word that can be made on board
+        #  - timer : the length of the match in seconds
+        self.server = server
+        self.name = name
+        self.board = board
+        self.words = words
+        self.timer = timer
+        self.players = {}  # player id : Connection
+        self.started = time.monotonic()
+        self.ended = False
+        self.end_handle = asyncio.get_running_loop().call_later(timer, self.end)
+
+    @property
+    def time_left(self):
+        return max(self.timer - (time.monotonic() - self.started), 0.0)
+
+    def broadcast(self, message):
+        # Sends message to every player in the match. It is encoded once, however many players there are.
+        line = MatchServer.encode(message)
+        for player in self.players.values():
+            player.send(line)
+
+    def join(self, player, name):
+        player.name = name
+        player.match = self
+        player.scoreboard = Scoreboard(self.words)
+        self.broadcast({"type": "joined", "player": player.id, "name": name})
+        self.players[player.id] = player
+        player.send(MatchServer.encode({
+            "type": "welcome", "player": player.id, "match": self.name,
+            "board": ["".join(row) for row in self.board], "time_left": round(self.time_left, 3),
+            "total_words": player.scoreboard.total_words,
+            "players": {player_id: other.name for player_id, other in self.players.items()},
+        }))
+
+    def leave(self, player):
+        if self.players.pop(player.id, None) is not None:
+            self.broadcast({"type": "left", "player": player.id})
+        player.match = None
+        if not self.players:
+            self.end()
+
+    def guess(self, player, path):
+        # Scores the word along path for player. The path must be a valid drag on this match's board.
+        if self.ended:
+            return self.reject(player, path, "match over")
+        try:
+            word = self.board.spell(path)
+        except (TypeError, ValueError):
+            word = None
+        if word is None:
+            return self.reject(player, path, "bad path")
+        score = self.words.get(word, 0)
+        if score <= 0:
+            return self.reject(player, path, "not a word")
+        if not player.scoreboard.add(word, score):
+            return self.reject(player, path, "already found")
+        self.broadcast({"type": "word", "player": player.id, "word": word, "score": score,
+                        "total": player.scoreboard.score_num})
+
+    @staticmethod
+    def reject(player, path, reason):
+        # Tells only player that their guess did not count.
+        player.send(MatchServer.encode({"type": "rejected", "path": path, "reason": reason}))
+
+    def end(self):
+        # Ends the match: sends everyone the final scores, best first, and removes it from the server.
+        # Called when the timer runs out, or when the last player leaves.
+        if self.ended:
+            return
+        self.ended = True
+        self.end_handle.cancel()
+        scores = sorted(([player.id, player.name, player.scoreboard.score_num, player.scoreboard.word_num]
+                         for player in self.players.values()), key=lambda score: (-score[2], score[0]))
+        self.broadcast({"type": "end", "scores": scores})
+        # The players stay connected and can join another match.
+        for player in self.players.values():
+            player.match = None
+        self.players = {}
+        if self.server.matches.get(self.name) is self:
+            del self.server.matches[self.name]
+
+
+class MatchServer:
+    # Hosts any number of matches at once, on one asyncio event loop.
+
+    def __init__(self, dictionary, boards=None, size=4, timer=80, flush_interval=0.02,
+                 max_buffer=1 << 20, seed=None, cache=None):
+        #  - dictionary     : a Trie or CompiledDictionary (e.g. from WordProcessor.loadDictionary)
+        #  -  cache         : (SolveCache, dictionary version) to read solved boards from, so boards that were
+        #                     played before (even before a restart) are not solved again. None to always solve.
+        #                     Worth it only with a fixed list of boards: sampled boards do not repeat.
+        #  - boards         : a list of boards (lists of rows of letters) to pick from for new matches.
+        #                     If not given, new boards are sampled with English letter frequencies.
+        #  -  size          : the number of rows and columns of sampled boards
+        #  -  timer         : the length of each match in seconds
+        #  - flush_interval : how long, in seconds, outgoing messages are gathered before they are written
+        #  -  max_buffer    : a player whose unsent data grows past this many bytes is too slow and is disconnected
+        self.solver = Solver(dictionary)
+        self.cache = cache
+        self.boards = boards
+        self.size = size
+        self.timer = timer
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.rng = random.Random(seed)
+        self.matches = {}  # match name : Match
+        self.starting = {}  # match name : the Task starting it, while its board is solved
+        # Boards are solved (and read from or written to the cache, which can wait on another process's lock)
+        # in this thread, so the event loop keeps serving every other match meanwhile. One thread, so the
+        # Solver and the cache are only ever used by one thread.
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="solve")
+        self.next_id = 1
+        self.pending = []  # Connections with queued messages.
+        self.flush_handle = None
+        # Counters for --stats.
+        self.connections = 0
+        self.received = 0
+        self.sent = 0
+        self.flushes = 0
+
+    @staticmethod
+    def encode(message):
+        return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def new_board(self):
+        if self.boards:
+            return Board(self.rng.choice(self.boards))
+        letters = list(english_letter_weights)
+        return Board(sample_board(self.rng, self.size, letters, [english_letter_weights[l] for l in letters]))
+
+    async def get_match(self, name):
+        # Returns the match called name, starting a new one if there is none (or the last one has ended).
+        # Players who join while it is starting all wait for the same one.
+        match = self.matches.get(name)
+        if match is not None:
+            return match
+        starting = self.starting.get(name)
+        if starting is None:
+            starting = asyncio.ensure_future(self.start_match(name))
+            self.starting[name] = starting
+        return await asyncio.shield(starting)
+
+    async def start_match(self, name):
+        # Solves a new board in self.executor and starts a match on it.
+        try:
+            board = self.new_board()
+            loop = asyncio.get_running_loop()
+            if self.cache is not None:
+                cache, version = self.cache
+                solutions = await loop.run_in_executor(self.executor, cache.solve, board, self.solver.trie, version)
+            else:
+                solutions = await loop.run_in_executor(self.executor, self.solver.solve, board)
+            words = {word: solution.score for word, solution in solutions.items()}
+            match = Match(self, name, board, words, self.timer)
+            self.matches[name] = match
+            return match
+        finally:
+            del self.starting[name]
+
+    def queue_flush(self, connection):
+        self.pending.append(connection)
+        if self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.flush_interval, self.flush)
+
+    def flush(self):
+        # Writes every connection's queued messages, joined into one write each.
+        self.flush_handle = None
+        self.flushes += 1
+        pending, self.pending = self.pending, []
+        for connection in pending:
+            if connection.closed or not connection.outbox:
+                continue
+            if connection.writer.transport.get_write_buffer_size() > self.max_buffer:
+                connection.close()
+                continue
+            self.sent += len(connection.outbox)
+            connection.writer.write(b"".join(connection.outbox))
+            connection.outbox.clear()
+
+    async def handle(self, reader, writer):
+        # Reads and handles one player's messages until they leave or disconnect.
+        player = Connection(self, reader, writer, self.next_id)
+        self.next_id += 1
+        self.connections += 1
+        try:
+            while not player.closed:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):  # ValueError: the line is longer than the limit.
+                    break
+                if not line:
+                    break
+                self.received += 1
+                try:
+                    message = json.loads(line)
+                    kind = message["type"]
+                except (ValueError, KeyError, TypeError):
+                    player.send(MatchServer.encode({"type": "error", "reason": "bad message"}))
+                    continue
+                if kind == "path" and player.match is not None:
+                    player.match.guess(player, message.get("path"))
+                elif kind == "join" and player.match is None:
+                    match = await self.get_match(str(message.get("match", "")))
+                    if not player.closed:
+                        match.join(player, str(message.get("name", "")))
+                elif kind == "leave":
+                    break
+                else:
+                    player.send(MatchServer.encode({"type": "error", "reason": "unexpected " + str(kind)}))
+        finally:
+            if player.match is not None:
+                player.match.leave(player)
+            if not player.closed:
+                # Whatever is queued for the player is sent before the connection closes.
+                self.flush()
+                player.close()
+            self.connections -= 1
+
+    async def report(self, interval):
+        # Prints the server's counters every interval seconds.
+        received, sent = self.received, self.sent
+        while True:
+            await asyncio.sleep(interval)
+            print(f"{self.connections} connections, {len(self.matches)} matches, "
+                  f"{(self.received - received) / interval:.0f} messages/s in, "
+                  f"{(self.sent - sent) / interval:.0f} messages/s out, {self.flushes} flushes")
+            received, sent = self.received, self.sent
+
+    async def serve(self, host, port, stats=0):
+        # Accepts players until cancelled.
+        #  - stats : if not 0, prints the counters every this many seconds
+        server = await asyncio.start_server(self.handle, host, port, backlog=4096, limit=1 << 16)
+        print("Serving on " + ", ".join(str(sock.getsockname()) for sock in server.sockets))
+        report = asyncio.ensure_future(self.report(stats)) if stats else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if report is not None:
+                report.cancel()
+            self.executor.shutdown(wait=False)
+
+
+def read_boards(file_name):
+    # Reads boards from the output of generate_boards.py (one JSON record per line, each with a "board").
+    boards = []
+    with open(file_name, "r") as file:
+        for line in file:
+            if line.strip():
+                boards.append([list(row) for row in json.loads(line)["board"]])
+    return boards
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host multiplayer Word Hunt matches over TCP (JSON lines).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dictionary", default="words.txt", help="word list or compiled dictionary")
+    parser.add_argument("--boards", help="a generate_boards.py output file to pick boards from")
+    parser.add_argument("--size", type=int, default=4, help="the size of sampled boards")
+    parser.add_argument("--timer", type=int, default=80, help="the length of each match in seconds")
+    parser.add_argument("--flush-interval", type=float, default=0.02,
+                        help="seconds to gather outgoing messages before writing them")
+    parser.add_argument("--seed", type=int, help="seed for the sampled boards")
+    parser.add_argument("--scoring", help="a JSON file of scoring rules (see scoring.ScoringRules)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="solve every board of --boards, without the solved board cache. Sampled boards "
+                             "are never cached: they do not repeat")
+    parser.add_argument("--stats", type=float, default=0, help="print counters every this many seconds")
+    args = parser.parse_args()
+
+    rules = ScoringRules.from_file(args.scoring) if args.scoring else None
+    cache = None
+    if args.boards and not args.no_cache:
+        solve_cache = SolveCache()
+        cache = (solve_cache, solve_cache.dictionary(args.dictionary, rules)[0])
+    server = MatchServer(WordProcessor.loadDictionary(args.dictionary, rules),
+                         boards=read_boards(args.boards) if args.boards else None, size=args.size,
+                         timer=args.timer, flush_interval=args.flush_interval, seed=args.seed, cache=cache)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.stats))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
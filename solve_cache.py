@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from solver import Solver, Solution
+from process_words import WordProcessor
+from scoring import default_rules
+from user_dirs import cache_file
+
+
+class SolveCache:
+    # Keeps solved boards (every word, its score and every path that spells it) in an SQLite file, so a board
+    # that comes up again (the default board, a daily puzzle, a match after a server restart) is read back
+    # instead of solved again. The most recently used results are also kept in memory, in front of the file.
+    #
+    # Results are keyed by a hash of the board's letters and the dictionary's version (a hash of the dictionary
+    # file and of the scoring rules), so editing the dictionary or the scoring never returns stale words. When the file grows past max_bytes,
+    # the least recently used results are deleted.
+
+    def __init__(self, file_name=None, max_bytes=64 << 20, memory_size=256):
+        #  -  file_name  : the SQLite file. Defaults to ~/.cache/wordhunt/solved.sqlite. None of the cache's errors
+        #                  are fatal: if the file cannot be opened, boards are solved every time.
+        #  -  max_bytes  : the most (compressed) result data kept in the file
+        #  - memory_size : the most results kept in memory
+        if file_name is None:
+            file_name = cache_file("solved.sqlite")
+        self.file_name = file_name
+        self.max_bytes = max_bytes
+        self.memory_size = memory_size
+        self.memory = OrderedDict()  # key : dictionary of word : Solution
+        # (dictionary file name, rules version) : (size, modification time, version, loaded dictionary)
+        self.dictionaries = {}
+        self.hits = 0  # Results found in memory or in the file.
+        self.misses = 0  # Boards that had to be solved.
+        self.connection = None
+        self.total_bytes = 0
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(file_name)), exist_ok=True)
+            # Several processes (e.g. generate_boards.py's workers) can share the file, so writers wait for each other.
+            # The cache can be used from a thread other than the one that made it (the match server solves boards
+            # in a worker thread), but only from one thread at a time.
+            self.connection = sqlite3.connect(file_name, timeout=30, isolation_level=None, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            # A cache can lose its last few writes in a power cut, so it does not wait for the disk on each one.
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS solved (key TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                                    "size INTEGER NOT NULL, used REAL NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS solved_used ON solved (used)")
+            self.total_bytes = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM solved").fetchone()[0]
+        except sqlite3.Error:
+            self.connection = None
+
+    @staticmethod
+    def key(board, version):
+        # Returns the key of board's result with the dictionary at version.
+        #  - board : a Board, or a list of rows of letters
+        letters = "/".join(",".join(letter.upper() for letter in row) for row in board)
+        return hashlib.sha1((version + "|" + letters).encode("utf-8")).hexdigest()
+
+    def dictionary(self, file_name, rules=None):
+        # Returns (version, loaded dictionary or None) of a dictionary file scored by rules (a ScoringRules,
+        # default scoring.default_rules). The version is a hash of the file and the rules' version. The file is
+        # hashed again only if its size or modification time changes. The dictionary is loaded on the first miss.
+        rules = rules or default_rules
+        stat = os.stat(file_name)
+        key = (file_name, rules.version)
+        entry = self.dictionaries.get(key)
+        if entry is None or entry[:2] != (stat.st_size, stat.st_mtime_ns):
+            digest = hashlib.sha1()
+            with open(file_name, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+            entry = (stat.st_size, stat.st_mtime_ns, digest.hexdigest() + "|" + rules.version, None)
+            self.dictionaries[key] = entry
+        return entry[2], entry[3]
+
+    def solve_file(self, board, dictionary_file, rules=None):
+        # Returns the solved board (see solve), with the dictionary in dictionary_file scored by rules.
+        # The file is only read if the board has to be solved.
+        version, dictionary = self.dictionary(dictionary_file, rules)
+        result = self.get(board, version)
+        if result is not None:
+            return result
+        if dictionary is None:
+            dictionary = WordProcessor.loadDictionary(dictionary_file, rules)
+            key = (dictionary_file, (rules or default_rules).version)
+            self.dictionaries[key] = self.dictionaries[key][:3] + (dictionary,)
+        return self.compute(board, dictionary, version)
+
+    def solve(self, board, dictionary, version):
+        # Returns a dictionary of word : Solution, with every path of each word (like Solver.solve with all_paths),
+        # from the cache if the board was solved before with this version of the dictionary.
+        #  - dictionary : a Trie or CompiledDictionary, only used if the board is not cached
+        #  -  version   : a string that changes whenever the dictionary's words or scores do
+        result = self.get(board, version)
+        if result is None:
+            result = self.compute(board, dictionary, version)
+        return result
+
+    def compute(self, board, dictionary, version):
+        # Solves a board that is not cached, and caches it.
+        self.misses += 1
+        result = Solver(dictionary).solve(board, all_paths=True)
+        self.put(board, version, result)
+        return result
+
+    def get(self, board, version):
+        # Returns the cached result of board, or None.
+        key = SolveCache.key(board, version)
+        result = self.memory.get(key)
+        if result is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return result
+        if self.connection is None:
+            return None
+        try:
+            row = self.connection.execute("SELECT data FROM solved WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute("UPDATE solved SET used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            return None
+        result = SolveCache.decode(row[0], board)
+        self.remember(key, result)
+        self.hits += 1
+        return result
+
+    def put(self, board, version, result):
+        # Stores the result of board, then evicts the least recently used results if the file is too big.
+        key = SolveCache.key(board, version)
+        self.remember(key, result)
+        if self.connection is None:
+            return
+        data = SolveCache.encode(result, board)
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+            old = self.connection.execute("SELECT size FROM solved WHERE key = ?", (key,)).fetchone()
+            self.connection.execute("INSERT OR REPLACE INTO solved VALUES (?, ?, ?, ?)",
+                                    (key, data, len(data), time.time()))
+            self.total_bytes += len(data) - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+            self.connection.execute("COMMIT")
+        except sqlite3.Error:
+            if self.connection.in_transaction:
+                self.connection.execute("ROLLBACK")
+
+    def evict(self):
+        # Deletes the least recently used results until the file is back under three quarters of max_bytes,
+        # so that eviction does not run again on every put. Must be called inside a transaction.
+        # Other processes may have added results too, so the total is counted again first.
+        self.total_bytes = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM solved").fetchone()[0]
+        target = self.max_bytes * 3 // 4
+        if self.total_bytes <= target:
+            return
+        freed = 0
+        doomed = []
+        for key, size in self.connection.execute("SELECT key, size FROM solved ORDER BY used"):
+            doomed.append((key,))
+            freed += size
+            if self.total_bytes - freed <= target:
+                break
+        self.connection.executemany("DELETE FROM solved WHERE key = ?", doomed)
+        self.total_bytes -= freed
+
+    def remember(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    @staticmethod
+    def encode(result, board):
+        # Packs a result as zlib compressed JSON: word : [score, path, path, ...], each path a list of cell numbers.
+        cols = len(board[0])
+        words = {word: [solution.score] + [[row * cols + col for row, col in path] for path in solution.paths]
+                 for word, solution in result.items()}
+        return zlib.compress(json.dumps(words, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def decode(data, board):
+        cols = len(board[0])
+        coords = [divmod(cell, cols) for cell in range(len(board) * cols)]  # cell number : (row, col)
+        result = {}
+        for word, (score, *paths) in json.loads(zlib.decompress(data)).items():
+            paths = [tuple(map(coords.__getitem__, path)) for path in paths]
+            solution = Solution(word, score, paths[0])
+            solution.paths = paths
+            result[word] = solution
+        return result
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+# Shared by everything in this process that solves boards (Game, the match server).
+# Created the first time it is needed, so importing this module never touches the disk.
+shared = None
+
+
+def shared_cache():
+    global shared
+    if shared is None:
+        shared = SolveCache()
+    return shared
@@ -0,0 +1,208 @@
+from board import Board
+from scoring import ScoreTable
+
+
+class TrieNode:
+    # One node in the prefix trie. The path of letters from the root to this node spells a prefix.
+    __slots__ = ("children", "word", "id")
+
+    def __init__(self):
+        self.children = {}  # letter : TrieNode
+        self.word = None  # The complete word ending at this node, or None if this node is only a prefix.
+        self.id = -1  # The word id of self.word, its index in the trie's score table. -1 if self.word is None.
+
+
+class Trie:
+    # A prefix tree of accepted words. Used to prune the board search as soon as a path
+    # spells something that is not the start of any word.
+    # The words' scores are kept in one ScoreTable, indexed by each word node's id.
+
+    def __init__(self, rules=None):
+        #  - rules : the ScoringRules that score words added without a score. Defaults to scoring.default_rules.
+        self.root = TrieNode()
+        self.scores = ScoreTable(rules)
+        self.size = 0  # The number of words stored.
+
+    @classmethod
+    def from_words(cls, words, rules=None):
+        # Builds a trie out of the words.
+        #  - words : either a dictionary of word : score (what WordProcessor.readWordsFile returns),
+        #            or any iterable of words, which are then scored by rules.
+        trie = cls(rules)
+        if isinstance(words, dict):
+            for word, score in words.items():
+                trie.insert(word, score)
+        else:
+            for word in words:
+                trie.insert(word)
+        return trie
+
+    def insert(self, word, score=None):
+        # Adds one word to the trie. Words are stored in all caps.
+        #  - score : the score of the word. If None, it is scored by the trie's rules.
+        word = word.strip().upper()
+        if not word.isalpha():
+            return
+        node = self.root
+        for letter in word:
+            child = node.children.get(letter)
+            if child is None:
+                child = TrieNode()
+                node.children[letter] = child
+            node = child
+        if node.word is None:
+            self.size += 1
+            node.word = word
+            node.id = self.scores.add(word, score)
+        else:
+            self.scores[node.id] = self.scores.rules.score(word) if score is None else score
+
+    def score_of(self, node):
+        # Returns the score of the word ending at node (a node with a word).
+        return self.scores[node.id]
+
+    def score(self, word):
+        # Returns the score of word, or None if it is not in the trie.
+        node = self.find(word)
+        if node is None or node.word is None:
+            return None
+        return self.scores[node.id]
+
+    def find(self, prefix):
+        # Returns the node reached by following prefix from the root, or None if no word starts with prefix.
+        node = self.root
+        for letter in prefix:
+            node = node.children.get(letter)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, word):
+        node = self.find(word)
+        return node is not None and node.word is not None
+
+    def __len__(self):
+        return self.size
+
+    def words(self):
+        # Yields (word, score) for every word, in alphabetical order, like CompiledDictionary.words.
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.word is not None:
+                yield node.word, self.scores[node.id]
+            stack.extend(node.children[letter] for letter in sorted(node.children, reverse=True))
+
+
+class Solution:
+    # One word that can be made on a board.
+    __slots__ = ("word", "score", "path", "paths")
+
+    def __init__(self, word, score, path):
+        self.word = word
+        self.score = score
+        self.path = path  # A tuple of (row, col) tile coordinates that spell the word, in order.
+        self.paths = [path]  # Every path that spells the word, if the solver was asked for all of them.
+
+    def __repr__(self):
+        return f"Solution({self.word!r}, {self.score}, {self.path})"
+
+
+class Solver:
+    # Finds every word in a trie that can be made on a board by dragging between adjacent tiles.
+
+    def __init__(self, trie):
+        self.trie = trie
+
+    def solve(self, board, all_paths=False):
+        # Returns a dictionary of word : Solution for every word that can be made on the board.
+        # When a word can be made more than one way, the first path found is kept in Solution.path.
+        #  -   board   : a Board, or a list of rows where each row is a list of letters (e.g. Game.board).
+        #  - all_paths : if true, every path of each word is also kept, in Solution.paths.
+        if not isinstance(board, Board):
+            board = Board(board)
+        cols = board.cols
+        letters = board.cells
+        neighbors = board.neighbors
+        score_of = self.trie.score_of
+        found = {}
+        path = []
+
+        def visit(cell, node, used):
+            # Follows every letter of the tile (so that multi-letter tiles like "QU" work).
+            # - used : bitmask of the cells already in the path
+            for letter in letters[cell]:
+                node = node.children.get(letter)
+                if node is None:
+                    return
+            used |= 1 << cell
+            path.append(cell)
+            if node.word is not None:
+                solution = found.get(node.word)
+                if solution is None:
+                    found[node.word] = Solution(node.word, score_of(node), tuple(divmod(i, cols) for i in path))
+                elif all_paths:
+                    solution.paths.append(tuple(divmod(i, cols) for i in path))
+            if node.children:
+                # The cells next to this one that are not in the path yet.
+                candidates = neighbors[cell] & ~used
+                while candidates:
+                    low_bit = candidates & -candidates
+                    visit(low_bit.bit_length() - 1, node, used)
+                    candidates ^= low_bit
+            path.pop()
+
+        root = self.trie.root
+        for cell in range(board.size):
+            visit(cell, root, 0)
+        return found
+
+
+class GuessCursor:
+    # Follows the player's guess through a trie one letter at a time, so that every tile added to the guess
+    # costs one step instead of rebuilding the string and looking it up again.
+    # Build it on a trie of the board's solved words, so that a dead prefix means "no words this way" on this board.
+
+    def __init__(self, trie, found=()):
+        #  - trie  : the Trie to follow
+        #  - found : the words that have already been found. Checked once per step.
+        self.trie = trie
+        self.found = found
+        self.reset()
+
+    def reset(self):
+        # Clears the guess.
+        self.letters = []  # The letters (or multi-letter tiles) pushed so far.
+        self.nodes = [self.trie.root]  # The trie node after each push. None once the guess leaves the trie.
+        self.text = ""
+        self._update()
+
+    def push(self, letters):
+        # Adds one tile's letters to the guess. Returns False if no word starts with the new guess.
+        node = self.nodes[-1]
+        for letter in letters:
+            if node is None:
+                break
+            node = node.children.get(letter)
+        self.letters.append(letters)
+        self.nodes.append(node)
+        self.text += letters
+        self._update()
+        return node is not None
+
+    def pop(self):
+        # Removes the last tile's letters from the guess.
+        if self.letters:
+            letters = self.letters.pop()
+            self.nodes.pop()
+            self.text = self.text[:-len(letters)]
+            self._update()
+
+    def _update(self):
+        # Works out the state of the current guess from its trie node. Only runs when the guess changes.
+        node = self.nodes[-1]
+        self.is_dead = node is None  # True if no word starts with the guess.
+        self.is_word = node is not None and node.word is not None
+        self.is_prefix = node is not None and len(node.children) > 0  # True if a longer word starts with the guess.
+        self.is_found = self.is_word and node.word in self.found
+        self.score = self.trie.score_of(node) if self.is_word else 0
@@ -1,28 +1,24 @@
 import pygame
+from assets import assets
 
 class Star:
+    # The full star image is big and only needed once the star is earned, so it is only fetched by fill_star,
+    # which gives Game.preload time to decode it in the background.
+    files = ("resources/star.png", "resources/star_outline.png")
+    size = (100, 100)
+
     def __init__(self, screen):
         self.screen = screen
-        self.size = (100, 100)
-        star = pygame.image.load("resources/star.png").convert_alpha()
-        self.star = pygame.transform.smoothscale(star, self.size)
-        empty_star = pygame.image.load("resources/star_outline.png").convert_alpha()
-        self.empty_star = pygame.transform.smoothscale(empty_star, self.size)
-
+        self.empty_star = assets.scaled(Star.files[1], Star.size)
 
+        # The part of the screen the star is drawn on.
+        rightX, bottomY = self.screen.get_size()
+        self.rect = pygame.Rect((rightX - 350, bottomY - 110), self.size)
 
     def draw(self):
         # Draws the empty star.
-
-        rightX, bottomY = self.screen.get_size()
-        x_pos, y_pos = rightX - 350, bottomY - 110
-
-        self.screen.blit(self.empty_star, (x_pos, y_pos))
-
+        self.screen.blit(self.empty_star, self.rect)
 
     def fill_star(self):
         # Draws the complete star.
-        rightX, bottomY = self.screen.get_size()
-        x_pos, y_pos = rightX - 350, bottomY - 110
-
-        self.screen.blit(self.star, (x_pos, y_pos))
+        self.screen.blit(assets.scaled(Star.files[0], Star.size), self.rect)
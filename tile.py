@@ -1,4 +1,5 @@
 import pygame
+from assets import assets
 
 
 class Tile:
@@ -11,6 +12,8 @@ class Tile:
     green = pygame.Color(135, 247, 135, 75)
     yellow = pygame.Color(254, 252, 130, 125)
     border_width = 3
+    image_file = "resources/square_rounded_corners.png"  # The tile's background image.
+    covers = {}  # ((r, g, b, a), (width, height)) : cover surface. See Tile.get_cover.
 
     @classmethod
     def set_screen(cls, screen):
@@ -29,122 +32,74 @@ class Tile:
 
         self.screen_position = screen_position
         # Smoothscale resizes the image and makes it appear smooth on the screen.
-        self.image = pygame.transform.smoothscale(surface, (width, height)) # This is the letter, with a transparent background.
+        # Tiles with the same letter share one scaled image.
+        self.image = assets.scale(surface, (width, height)) # This is the letter, with a transparent background.
 
         self.letter = letter
         self.row = row
         self.col = column
-        rounded_square = pygame.image.load("resources/square_rounded_corners.png").convert_alpha() # This is image used as the background of the tile.
-        self.background = pygame.transform.smoothscale(rounded_square, (width, height))
+        # This is image used as the background of the tile. It is loaded and scaled once for all tiles.
+        self.background = assets.scaled(Tile.image_file, (width, height))
 
         # Creates a rectangle defining our boundaries.
         x, y = screen_position
         padding = 10  # between rectangle outline and the tile
         self.rect = pygame.Rect(x + padding, y + padding, width - 2 * padding, height - 2 * padding)
+        # The part of the screen the tile is drawn on. It is the same size as self.image.
+        self.draw_rect = self.image.get_rect(center=self.rect.center)
 
-        # Creates the surfaces for the three different covers: white, green, yellow.
-        self.white_cover = pygame.Surface((width, height), pygame.SRCALPHA)
-        self.green_cover = pygame.Surface((width, height), pygame.SRCALPHA)
-        self.yellow_cover = pygame.Surface((width, height), pygame.SRCALPHA)
-        # Makes semi-transparent covers that appear when pressed.
-        # border_radius makes the rectangle have rounded corners.
-        pygame.draw.rect(self.white_cover, Tile.white, self.white_cover.get_rect(), border_radius=10)
-        self.white_cover.set_alpha(0)  # Set them invisible for now, at the beginning.
+        # The tile is drawn in one of four states: plain, or with a white, green or yellow cover.
+        # Each state is drawn once here, onto an opaque surface that includes what is behind the tile's corners,
+        # so that changing the color of the tile is one plain blit.
+        self.state = None  # None for plain, otherwise the (r, g, b, a) of the cover's color.
+        self.state_surfaces = {None: self.composite(None)}
+        for color in (Tile.white, Tile.green, Tile.yellow):
+            self.state_surfaces[tuple(color)] = self.composite(color)
 
-        pygame.draw.rect(self.green_cover, Tile.green, self.green_cover.get_rect(), border_radius=10)
-        self.green_cover.set_alpha(0)
-
-        pygame.draw.rect(self.yellow_cover, self.yellow, self.yellow_cover.get_rect(), border_radius=10)
-        self.yellow_cover.set_alpha(0)
-
-    def draw_content(self):
-        # Draws the tile, with the bakcground and letter, onto the screen.
+    @classmethod
+    def set_backdrop(cls, backdrop):
+        # sets the class attribute, backdrop
+        # -  backdrop : a surface the size of the screen with what is drawn behind the tiles (the background)
+        cls.backdrop = backdrop
 
-        # Makes the drawn tile the same size as self.image.
-        image_rect = self.image.get_rect(center=self.rect.center)
-        # Blits to the screen the wooden square background and the tile.
-        Tile.screen.blit(self.background, image_rect)
-        Tile.screen.blit(self.image, image_rect)
+    @classmethod
+    def get_cover(cls, color, size):
+        # Returns a semi-transparent rectangle with rounded corners in color. Shared by every tile of that size.
+        key = (tuple(color), size)
+        cover = Tile.covers.get(key)
+        if cover is None:
+            cover = pygame.Surface(size, pygame.SRCALPHA)
+            # border_radius makes the rectangle have rounded corners.
+            pygame.draw.rect(cover, color, cover.get_rect(), border_radius=10)
+            Tile.covers[key] = cover
+        return cover
+
+    def composite(self, color):
+        # Returns an opaque surface of the tile: the backdrop, the wooden square background, the letter,
+        # and then the cover in color on top (no cover if color is None).
+        surface = pygame.Surface(self.draw_rect.size).convert()
+        surface.blit(Tile.backdrop, (0, 0), self.draw_rect)
+        surface.blit(self.background, (0, 0))
+        surface.blit(self.image, (0, 0))
+        if color is not None:
+            surface.blit(Tile.get_cover(color, self.draw_rect.size), (0, 0))
+        return surface
 
     def draw(self, color=main_color):
-        # Draw the tile, then draws the rectangle border on top in color.
-        self.draw_content()
-        # pygame.draw.rect(Tile.screen, color, self.rect, Tile.border_width)
-
-    def set_cover(self, cover):
-        # Helper function for self.change_color that makes the cover visible.
-
-        # Makes the drawn tile the same size as self.image.
-        image_rect = self.image.get_rect(center=self.rect.center)
-
-        cover.set_alpha(255)
-        Tile.screen.blit(cover, image_rect)
-        # This is unneeded.
-        # self.reset_other_covers(cover)
+        # Draws the tile in its current state.
+        Tile.screen.blit(self.state_surfaces[self.state], self.draw_rect)
 
     def reset_covers(self):
-        # Makes all covers invisible. Necessary so that when you do make the covers visible, you can check
-        # the alpha value to blit it once, rather than continually blitting it onto the screen (which makes it opaque).
-
-        self.white_cover.set_alpha(0)
-        self.green_cover.set_alpha(0)
-        self.yellow_cover.set_alpha(0)
-
-    def reset_other_covers(self, cover):
-        # Makes the covers beside the color cover invisible.
-        # This is done specifically to fix the bug where multiple covers are visible at the same time.
-
-        if cover is self.white_cover:
-            self.green_cover.set_alpha(0)
-            self.yellow_cover.set_alpha(0)
-        elif cover is self.green_cover:
-            self.white_cover.set_alpha(0)
-            self.yellow_cover.set_alpha(0)
-        elif cover is self.yellow_cover:
-            self.white_cover.set_alpha(0)
-            self.green_cover.set_alpha(0)
+        # Sets the tile back to plain, without a cover. The tile is shown without a cover on the next self.draw().
+        self.state = None
 
     def change_color(self, color):
-        # Makes the semi-transparent rectangle over the tile visible.
-
-        if color == Tile.white:
-            transparency = self.white_cover.get_alpha()
-            if transparency == 0:
-                self.set_cover(self.white_cover)
-        elif color == Tile.green:
-            transparency = self.green_cover.get_alpha()
-            if transparency == 0:
-                self.set_cover(self.green_cover)
-        elif color == Tile.yellow:
-            transparency = self.yellow_cover.get_alpha()
-            if transparency == 0:
-                self.set_cover(self.yellow_cover)
-
-
-
-    def isTileNearby(self, other_coords: tuple):
-        # Checks if the other tile is next to this tile (horizontally, vertically, diagonally).
-        # Assumes the board is 4x4.
-        #  - other_coords : (row, column) of the other tile in the game board.
-        if other_coords != ():
-            other_row, other_col = other_coords
-            col_difference = self.col - other_col
-            row_difference = self.row - other_row
-
-            # Case 1: the other tile is the same as this tile.
-            if self.row == other_row and self.col == other_col:
-                return False
-            # Case 2: in same row (horizontal)
-            elif self.row == other_row:
-                if col_difference == 1 or col_difference == -1:
-                    return True
-            # Case 3: in same column (vertical)
-            elif self.col == other_col:
-                if row_difference == 1 or row_difference == -1:
-                    return True
-            # Case 4: diagonal
-            elif (row_difference == 1 or row_difference == -1) and (col_difference == 1 or col_difference == -1):
-                return True
-            # Otherwise, they are not nearby.
-            else:
-                return False
+        # Draws the tile with a cover in color (Tile.white, Tile.green or Tile.yellow).
+        # Only one cover is ever shown, because each state is a separate surface.
+        # Returns True if the tile was drawn again, so that its self.draw_rect needs to be shown on the display.
+        state = tuple(color)
+        if state not in self.state_surfaces or state == self.state:
+            return False
+        self.state = state
+        self.draw()
+        return True
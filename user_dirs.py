@@ -0,0 +1,22 @@
+import os
+
+
+# Where files kept between runs go, following the XDG base directory spec.
+
+
+def cache_file(name):
+    # Returns the path of name in the cache directory: $XDG_CACHE_HOME/wordhunt, by default ~/.cache/wordhunt.
+    # Files there only save time and can be deleted at any time.
+    return user_file("XDG_CACHE_HOME", (".cache",), name)
+
+
+def data_file(name):
+    # Returns the path of name in the data directory: $XDG_DATA_HOME/wordhunt, by default ~/.local/share/wordhunt.
+    return user_file("XDG_DATA_HOME", (".local", "share"), name)
+
+
+def user_file(variable, default, name):
+    #  - variable : the environment variable that names the base directory
+    #  - default  : the base directory, inside the home directory, if the variable is not set
+    home = os.environ.get(variable) or os.path.join(os.path.expanduser("~"), *default)
+    return os.path.join(home, "wordhunt", name)
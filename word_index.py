@@ -0,0 +1,61 @@
+from collections import Counter
+from solver import Solver
+
+
+class WordIndex:
+    # Every word that can be scored on a board, with every path that spells it, built once when the board loads.
+    # Used to show where any word is (for hints and the end of game reveal), and keeps counts of the words
+    # not found yet by starting tile and by length, which are updated as each word is found.
+
+    def __init__(self, solutions):
+        #  - solutions : dictionary of word : Solution, from Solver.solve(board, all_paths=True)
+        # Words worth no points (e.g. 2 letter words) can never be found, so they are left out.
+        self.solutions = {word: solution for word, solution in solutions.items() if solution.score > 0}
+        self.found = set()
+        self.remaining_by_start = Counter()  # (row, col) : the number of words not found that can start there
+        self.remaining_by_length = Counter()  # length : the number of words of that length not found
+        for word, solution in self.solutions.items():
+            for start in self.starts(word):
+                self.remaining_by_start[start] += 1
+            self.remaining_by_length[len(word)] += 1
+
+    @classmethod
+    def build(cls, board, trie):
+        # Solves the board against trie (normally a trie of only the board's words) and indexes the result.
+        return cls(Solver(trie).solve(board, all_paths=True))
+
+    def starts(self, word):
+        # Returns the set of tiles, (row, col), that word can start on.
+        return {path[0] for path in self.solutions[word].paths}
+
+    def path(self, word):
+        # Returns one path of (row, col) that spells word, or None if word is not on the board.
+        solution = self.solutions.get(word)
+        return solution.path if solution is not None else None
+
+    def paths(self, word):
+        # Returns every path that spells word (an empty list if word is not on the board).
+        solution = self.solutions.get(word)
+        return solution.paths if solution is not None else []
+
+    def mark_found(self, word):
+        # Takes a newly found word out of the remaining counts. Does nothing if word is not indexed or already found.
+        if word not in self.solutions or word in self.found:
+            return
+        self.found.add(word)
+        for start in self.starts(word):
+            self.remaining_by_start[start] -= 1
+        self.remaining_by_length[len(word)] -= 1
+
+    def missed(self):
+        # Returns the words not found, highest score first (and alphabetically for equal scores).
+        words = [word for word in self.solutions if word not in self.found]
+        return sorted(words, key=lambda word: (-self.solutions[word].score, word))
+
+    def hint(self):
+        # Returns the word not found that is worth the most, or None if every word has been found.
+        words = (word for word in self.solutions if word not in self.found)
+        return min(words, key=lambda word: (-self.solutions[word].score, word), default=None)
+
+    def __len__(self):
+        return len(self.solutions)